@@ -15,7 +15,7 @@ from pathlib import Path
 APP_NAME = "战雷连杀导出工具"
 MAIN_SCRIPT = "wt_killstreak_exporter.py"
 ICON_FILE = "icon.ico"
-VERSION_FILE = "exporter/__init__.py"
+VERSION_FILE = "exporter/_version.py"
 
 def get_version():
     """从版本文件中获取当前版本号"""
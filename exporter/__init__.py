@@ -4,7 +4,14 @@
 连杀片段导出工具 - 核心包
 """
 
-from exporter.core.processor import process_videos
-from exporter.utils.constants import STATE_FILE
+from exporter._version import __version__
 
-__version__ = "1.0.3" 
\ No newline at end of file
+def __getattr__(name):
+    """按需导入处理模块，导入包本身不会加载视频处理依赖"""
+    if name == "process_videos":
+        from exporter.core.processor import process_videos
+        return process_videos
+    if name == "STATE_FILE":
+        from exporter.utils.constants import STATE_FILE
+        return STATE_FILE
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
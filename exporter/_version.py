@@ -0,0 +1,7 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+版本号模块（不导入其他模块，供界面启动时快速读取）
+"""
+
+__version__ = "1.0.3"
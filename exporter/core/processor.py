@@ -11,6 +11,7 @@
 """
 
 import os
+import inspect
 import subprocess
 import platform
 from datetime import datetime, timedelta
@@ -19,14 +20,16 @@ import time
 from exporter.utils.constants import (
     TYPICAL_VIDEO_LENGTH, TYPICAL_KILL_POSITION,
     GPU_ENCODE_PRESET, CPU_ENCODE_PRESET, VIDEO_BITRATE, MAX_BITRATE,
+    GPU_ENCODE_TUNE, HEVC_NVENC_MULTIPASS,
     BUFFER_SIZE, AUDIO_BITRATE, CRF_VALUE, CQ_VALUE,
     KILL_LEAD_TIME, KILL_TAIL_TIME, ENFORCE_CPU_ENCODE
 )
 from exporter.utils.file_utils import (
-    parse_video_time, load_last_processed_time, save_last_processed_time
+    iter_new_videos, load_last_processed_time, save_last_processed_time
 )
 from exporter.utils.ffmpeg_utils import (
-    get_video_duration, cut_video, get_startupinfo, check_encoder_availability, get_video_info
+    get_video_duration, cut_video, get_startupinfo, check_encoder_availability, get_video_info,
+    load_probe_cache, save_probe_cache
 )
 from exporter.core.models import TimeSegment
 
@@ -48,7 +51,9 @@ def process_videos(input_dir, output_dir, lead=10, tail=2, threshold=30, min_kil
         tail: 击杀后保留时间（秒），用于连杀识别
         threshold: 连杀时间阈值（秒）
         min_kills: 最少击杀数
-        progress_callback: 进度回调函数
+        progress_callback: 进度回调函数，调用形式为progress_callback(当前值, 总数, 消息, phase=阶段)，
+            阶段为"scan"（扫描视频文件）、"process"（处理连杀片段）、"done"（处理完成），
+            仅报告消息时不传phase；不接受phase参数的旧回调仍按(当前值, 总数, 消息)调用
         state_file: 状态文件路径
         temp_dir: 临时文件目录
         is_running: 运行状态检查函数
@@ -56,13 +61,18 @@ def process_videos(input_dir, output_dir, lead=10, tail=2, threshold=30, min_kil
     Returns:
         int: 成功导出的视频数量
     """
+    # 兼容不接受phase参数的旧回调
+    progress_callback = _adapt_progress_callback(progress_callback)
+    
     # 1. 初始化处理环境
     temp_dir = _init_processing_environment(output_dir, temp_dir)
+    load_probe_cache(temp_dir)
     
     # 2. 扫描并加载视频文件信息
-    all_files_info, skipped_count, latest_time = _scan_video_files(
+    all_files_info, latest_time = _scan_video_files(
         input_dir, state_file, progress_callback, is_running
     )
+    save_probe_cache(temp_dir)
     
     if not all_files_info:
         print("未找到需要处理的新视频文件。")
@@ -79,10 +89,27 @@ def process_videos(input_dir, output_dir, lead=10, tail=2, threshold=30, min_kil
     
     # 5. 完成处理并更新状态
     _finalize_processing(successful_exports, latest_time, state_file, all_files_info)
+    save_probe_cache(temp_dir)
     
     return successful_exports
 
 
+def _adapt_progress_callback(callback):
+    """回调不接受phase关键字参数时，返回丢弃phase后再调用的包装函数"""
+    if callback is None:
+        return None
+    try:
+        params = inspect.signature(callback).parameters.values()
+    except (TypeError, ValueError):
+        # 无法获取签名（如部分内置函数），按旧形式调用
+        params = ()
+    if any(p.name == "phase" or p.kind == p.VAR_KEYWORD for p in params):
+        return callback
+    
+    def legacy_callback(current, total, message="", phase=None):
+        return callback(current, total, message)
+    return legacy_callback
+
 def _init_processing_environment(output_dir, temp_dir=None):
     """初始化处理环境，设置临时目录"""
     cache_dir = os.path.join(output_dir, "temp")
@@ -101,38 +128,26 @@ def _scan_video_files(input_dir, state_file, progress_callback=None, is_running=
     print(f"上次处理到时间: {last_processed_time}" if last_processed_time else "首次处理或未找到记录，将处理所有视频。")
     
     all_files_info = []
-    skipped_count = 0
     print(f"扫描输入目录: {input_dir}")
     
-    # 扫描所有MP4文件
-    mp4_files = [f for f in os.listdir(input_dir) if f.endswith(".mp4")]
-    total_files = len(mp4_files)
+    # 一次遍历目录，只保留晚于上次处理时间的录像
+    new_videos = list(iter_new_videos(input_dir, last_processed_time))
+    total_files = len(new_videos)
     processed_files = 0
     
     # 更新初始进度
     if progress_callback:
-        progress_callback(0, total_files, "开始扫描视频文件...")
+        progress_callback(0, total_files, "开始扫描视频文件...", phase="scan")
     
     latest_video_time = None
     
-    for fname in mp4_files:
+    for full_path, fname, start_time in new_videos:
         # 检查是否应该停止处理
         if is_running is not None and not is_running():
             print("用户取消处理，正在退出...")
-            return [], 0, None
+            return [], None
             
         processed_files += 1
-        full_path = os.path.join(input_dir, fname)
-        start_time = parse_video_time(fname)
-        
-        if not start_time:
-            print(f"  跳过: 无法解析时间 {fname}")
-            continue
-        
-        # 如果设置了上次处理时间，则跳过旧视频
-        if last_processed_time and start_time <= last_processed_time:
-            skipped_count += 1
-            continue # 跳过这个文件
 
         # 使用 ffprobe 获取实际视频时长
         duration_sec = get_video_duration(full_path)
@@ -159,10 +174,10 @@ def _scan_video_files(input_dir, state_file, progress_callback=None, is_running=
         
         # 更新扫描进度
         if progress_callback:
-            progress_callback(processed_files, total_files, f"扫描: {fname}")
+            progress_callback(processed_files, total_files, f"扫描: {fname}", phase="scan")
 
-    print(f"扫描完成: 找到 {len(all_files_info)} 个新视频文件，跳过 {skipped_count} 个已处理或过早的视频。")
-    return all_files_info, skipped_count, latest_video_time
+    print(f"扫描完成: 找到 {len(all_files_info)} 个新视频文件。")
+    return all_files_info, latest_video_time
 
 
 def _identify_killstreaks(video_files, lead, tail, threshold, min_kills, is_running=None):
@@ -238,7 +253,7 @@ def _process_killstreak_segments(valid_segments, videos, output_dir, temp_dir,
         # 更新进度 - 合并区间阶段
         current_step += 1
         if progress_callback:
-            progress_callback(current_step, total_processing_steps, f"分析连杀片段 {idx}/{segment_count} (击杀数: {len(segment.kill_times)})")
+            progress_callback(current_step, total_processing_steps, f"分析连杀片段 {idx}/{segment_count} (击杀数: {len(segment.kill_times)})", phase="process")
         
         print(f"\n处理第 {idx} 个连杀片段 (击杀数: {len(segment.kill_times)})")
         
@@ -299,7 +314,7 @@ def _process_killstreak_segments(valid_segments, videos, output_dir, temp_dir,
                 # 更新进度 - 导出阶段完成
                 current_step += 1
                 if progress_callback:
-                    progress_callback(current_step, total_processing_steps, f"导出完成 {idx}/{segment_count} (文件: {output_filename})")
+                    progress_callback(current_step, total_processing_steps, f"导出完成 {idx}/{segment_count} (文件: {output_filename})", phase="process")
                 continue
         
         # 多区间或单区间但无法单视频覆盖的情况
@@ -314,11 +329,12 @@ def _process_killstreak_segments(valid_segments, videos, output_dir, temp_dir,
         current_step += 1
         if progress_callback:
             progress_callback(current_step, total_processing_steps, 
-                             f"导出{'成功' if result else '失败'} {idx}/{segment_count} (文件: {output_filename})")
+                             f"导出{'成功' if result else '失败'} {idx}/{segment_count} (文件: {output_filename})",
+                             phase="process")
     
     # 更新最终进度
     if progress_callback:
-        progress_callback(total_processing_steps, total_processing_steps, f"处理完成，成功导出 {successful_exports}/{segment_count} 个片段")
+        progress_callback(total_processing_steps, total_processing_steps, f"处理完成，成功导出 {successful_exports}/{segment_count} 个片段", phase="done")
         
     return successful_exports
 
@@ -373,6 +389,7 @@ def _process_single_interval(interval, videos, output_path, temp_dir, is_running
                     '-t', str(duration),
                     '-c', 'copy',  # 直接复制流，不重新编码
                     '-avoid_negative_ts', 'make_zero',
+                    '-movflags', '+faststart',  # moov前置，便于播放器和编辑软件快速打开
                     '-y',
                     output_path
                 ]
@@ -446,6 +463,7 @@ def _process_single_interval(interval, videos, output_path, temp_dir, is_running
                         cmd.extend([
                             '-c:v', 'h264_nvenc',
                             '-preset', GPU_ENCODE_PRESET,
+                            '-tune', GPU_ENCODE_TUNE,
                             '-rc', 'vbr',
                             '-cq', CQ_VALUE,
                             '-b:v', VIDEO_BITRATE,
@@ -453,6 +471,7 @@ def _process_single_interval(interval, videos, output_path, temp_dir, is_running
                             '-bufsize', BUFFER_SIZE,
                             '-c:a', 'copy',  # 保持原始音频
                             '-vsync', 'vfr',
+                            '-movflags', '+faststart',
                             '-y',
                             output_path
                         ])
@@ -491,6 +510,8 @@ def _process_single_interval(interval, videos, output_path, temp_dir, is_running
                         cmd.extend([
                             '-c:v', 'hevc_nvenc',
                             '-preset', GPU_ENCODE_PRESET,
+                            '-tune', GPU_ENCODE_TUNE,
+                            '-multipass', HEVC_NVENC_MULTIPASS,
                             '-rc', 'vbr',
                             '-cq', CQ_VALUE,
                             '-b:v', VIDEO_BITRATE,
@@ -498,6 +519,7 @@ def _process_single_interval(interval, videos, output_path, temp_dir, is_running
                             '-bufsize', BUFFER_SIZE,
                             '-c:a', 'copy',  # 保持原始音频
                             '-vsync', 'vfr',
+                            '-movflags', '+faststart',
                             '-y',
                             output_path
                         ])
@@ -537,6 +559,7 @@ def _process_single_interval(interval, videos, output_path, temp_dir, is_running
                             '-bufsize', BUFFER_SIZE,
                             '-c:a', 'copy',  # 保持原始音频
                             '-vsync', 'vfr',
+                            '-movflags', '+faststart',
                             '-y',
                             output_path
                         ])
@@ -1058,6 +1081,7 @@ def _try_nvidia_h264_two_step(input_args, filter_script_path, temp_dir, output_p
             '-i', temp_output,
             '-c:v', 'h264_nvenc',
             '-preset', GPU_ENCODE_PRESET,
+            '-tune', GPU_ENCODE_TUNE,
             '-rc', 'vbr',
             '-cq', CQ_VALUE,
             '-b:v', VIDEO_BITRATE,
@@ -1065,6 +1089,7 @@ def _try_nvidia_h264_two_step(input_args, filter_script_path, temp_dir, output_p
             '-bufsize', BUFFER_SIZE,
             '-c:a', 'copy',
             '-vsync', 'vfr',
+            '-movflags', '+faststart',
             '-y',
             output_path
         ]
@@ -1134,6 +1159,8 @@ def _try_nvidia_hevc_two_step(input_args, filter_script_path, temp_dir, output_p
             '-i', temp_output,
             '-c:v', 'hevc_nvenc',
             '-preset', GPU_ENCODE_PRESET,
+            '-tune', GPU_ENCODE_TUNE,
+            '-multipass', HEVC_NVENC_MULTIPASS,
             '-rc', 'vbr',
             '-cq', CQ_VALUE,
             '-b:v', VIDEO_BITRATE,
@@ -1141,6 +1168,7 @@ def _try_nvidia_hevc_two_step(input_args, filter_script_path, temp_dir, output_p
             '-bufsize', BUFFER_SIZE,
             '-c:a', 'copy',
             '-vsync', 'vfr',
+            '-movflags', '+faststart',
             '-y',
             output_path
         ]
@@ -1184,6 +1212,7 @@ def _try_nvidia_h264(input_args, filter_script_path, output_path):
             '-map', '[outa]',
             '-c:v', 'h264_nvenc',
             '-preset', GPU_ENCODE_PRESET,
+            '-tune', GPU_ENCODE_TUNE,
             '-rc', 'vbr',
             '-cq', CQ_VALUE,
             '-b:v', VIDEO_BITRATE,
@@ -1192,6 +1221,7 @@ def _try_nvidia_h264(input_args, filter_script_path, output_path):
             '-c:a', 'aac',
             '-b:a', AUDIO_BITRATE,
             '-vsync', 'vfr',  # 可变帧率同步，配合mpdecimate使用
+            '-movflags', '+faststart',
             '-y',
             output_path
         ]
@@ -1228,6 +1258,8 @@ def _try_nvidia_hevc(input_args, filter_script_path, output_path):
             '-map', '[outa]',
             '-c:v', 'hevc_nvenc',
             '-preset', GPU_ENCODE_PRESET,
+            '-tune', GPU_ENCODE_TUNE,
+            '-multipass', HEVC_NVENC_MULTIPASS,
             '-rc', 'vbr',
             '-cq', CQ_VALUE,
             '-b:v', VIDEO_BITRATE,
@@ -1236,6 +1268,7 @@ def _try_nvidia_hevc(input_args, filter_script_path, output_path):
             '-c:a', 'aac',
             '-b:a', AUDIO_BITRATE,
             '-vsync', 'vfr',  # 可变帧率同步，配合mpdecimate使用
+            '-movflags', '+faststart',
             '-y',
             output_path
         ]
@@ -1279,6 +1312,7 @@ def _try_cpu_encode(input_args, filter_script_path, output_path):
             '-c:a', 'aac',
             '-b:a', AUDIO_BITRATE,
             '-vsync', 'vfr',  # 可变帧率同步，配合mpdecimate使用
+            '-movflags', '+faststart',
             '-y',
             output_path
         ]
@@ -1331,6 +1365,7 @@ def _try_simple_cpu_encode(input_args, filter_script_path, temp_dir, output_path
             '-crf', '23',            # 稍微降低质量以提高速度
             '-c:a', 'aac',
             '-b:a', AUDIO_BITRATE,
+            '-movflags', '+faststart',
             '-y',
             output_path
         ]
@@ -1421,6 +1456,7 @@ def _try_segment_by_segment(segments, temp_dir, output_path):
             '-safe', '0',
             '-i', concat_list,
             '-c', 'copy',
+            '-movflags', '+faststart',
             '-y',
             output_path
         ]
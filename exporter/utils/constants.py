@@ -15,6 +15,8 @@ KILL_TAIL_TIME = 5  # 击杀后保留时间（秒）
 
 # 视频编码参数 - 设置为无损或最高质量
 GPU_ENCODE_PRESET = 'p7'  # NVENC最高质量预设
+GPU_ENCODE_TUNE = 'hq'  # NVENC调优模式（hq高质量 / ll低延迟 / ull超低延迟）
+HEVC_NVENC_MULTIPASS = 'qres'  # HEVC NVENC多遍编码模式（qres四分之一分辨率首遍）
 CPU_ENCODE_PRESET = 'veryslow'  # CPU最高质量预设
 VIDEO_BITRATE = '0'  # 不限制码率
 MAX_BITRATE = '0'  # 不限制最大码率
@@ -26,6 +28,7 @@ CQ_VALUE = '0'  # 最高质量（无损）
 # 编码器设置
 ENFORCE_CPU_ENCODE = False  # 强制使用CPU编码
 DEBUG_GPU_ENCODER = True  # GPU编码调试模式
+USE_NVDEC_DECODE = True  # GPU编码去重时使用NVDEC硬件解码
 
 # 去重设置 
 REMOVE_DUPLICATE_FRAMES = True  # 是否启用去重帧功能
@@ -6,17 +6,33 @@ FFmpeg视频处理工具模块
 
 import os
 import time
+import asyncio
 import subprocess
 import platform
 from datetime import datetime
 import json
 
+# PyAV为可选依赖，可在进程内直接读取容器头信息，避免启动ffprobe子进程
+try:
+    import av
+except ImportError:
+    av = None
+
+# orjson为可选依赖，可直接解析bytes，比标准库json更快；json.loads同样接受bytes
+try:
+    import orjson
+    _json_loads = orjson.loads
+except ImportError:
+    orjson = None
+    _json_loads = json.loads
+
 from exporter.utils.constants import (
     GPU_ENCODE_PRESET, CPU_ENCODE_PRESET, VIDEO_BITRATE, MAX_BITRATE,
+    GPU_ENCODE_TUNE, HEVC_NVENC_MULTIPASS,
     BUFFER_SIZE, AUDIO_BITRATE, CRF_VALUE, CQ_VALUE,
     REMOVE_DUPLICATE_FRAMES, DUPLICATE_THRESHOLD_HI, DUPLICATE_THRESHOLD_LO, DUPLICATE_FRACTION,
-    FREEZE_DETECT_NOISE, FREEZE_DETECT_DURATION, SCENE_CHANGE_THRESHOLD, ENFORCE_CPU_ENCODE,
-    DEBUG_GPU_ENCODER
+    FREEZE_DETECT_NOISE, FREEZE_DETECT_DURATION, ENFORCE_CPU_ENCODE,
+    DEBUG_GPU_ENCODER, USE_NVDEC_DECODE
 )
 
 def get_startupinfo():
@@ -28,8 +44,89 @@ def get_startupinfo():
         return startupinfo
     return None
 
+# ffmpeg静默参数：仅输出错误信息，不输出横幅与进度统计
+_FFMPEG_QUIET_ARGS = ('-hide_banner', '-loglevel', 'error', '-nostats')
+
+def _quiet_command(cmd):
+    """在ffmpeg命令中插入静默参数"""
+    return [cmd[0], *_FFMPEG_QUIET_ARGS, *cmd[1:]]
+
+def _run_ffmpeg(cmd):
+    """执行ffmpeg命令，丢弃标准输出，仅保留stderr用于错误报告
+
+    失败时抛出CalledProcessError，其stderr为未解码的bytes
+    """
+    subprocess.run(_quiet_command(cmd), check=True, stdout=subprocess.DEVNULL,
+                   stderr=subprocess.PIPE, startupinfo=get_startupinfo())
+
+def _ffmpeg_error(e):
+    """格式化ffmpeg错误信息，仅在需要输出时才解码stderr"""
+    stderr = e.stderr
+    if isinstance(stderr, bytes):
+        stderr = stderr.decode('utf-8', errors='replace')
+    stderr = (stderr or '').strip()
+    return f"{e}\n{stderr}" if stderr else str(e)
+
+# 视频探测结果缓存：(类型, 绝对路径, 文件大小, 修改时间ns) -> 结果
+# 文件被改写时大小或修改时间会变化，缓存自动失效
+_PROBE_CACHE = {}
+PROBE_CACHE_FILE = 'probe_cache.json'
+
+def _probe_cache_key(kind, video_path):
+    """生成探测缓存键，文件不存在时返回None"""
+    try:
+        st = os.stat(video_path)
+    except OSError:
+        return None
+    return (kind, os.path.abspath(video_path), st.st_size, st.st_mtime_ns)
+
+def load_probe_cache(cache_dir):
+    """从缓存目录加载上次运行保存的探测结果"""
+    cache_path = os.path.join(cache_dir, PROBE_CACHE_FILE)
+    try:
+        with open(cache_path, 'r', encoding='utf-8') as f:
+            entries = json.load(f)
+        for kind, path, size, mtime_ns, value in entries:
+            _PROBE_CACHE[(kind, path, size, mtime_ns)] = value
+        print(f"已加载 {len(entries)} 条视频探测缓存")
+    except FileNotFoundError:
+        pass
+    except (OSError, ValueError, TypeError) as e:
+        print(f"无法加载视频探测缓存 ({cache_path}): {e}")
+
+def save_probe_cache(cache_dir):
+    """将探测结果保存到缓存目录，供下次运行复用"""
+    cache_path = os.path.join(cache_dir, PROBE_CACHE_FILE)
+    try:
+        # 只保存文件仍存在且未被修改的条目，避免缓存文件无限增长
+        entries = [[*key, value] for key, value in _PROBE_CACHE.items()
+                   if _probe_cache_key(key[0], key[1]) == key]
+        with open(cache_path, 'w', encoding='utf-8') as f:
+            json.dump(entries, f, ensure_ascii=False)
+    except OSError as e:
+        print(f"无法保存视频探测缓存 ({cache_path}): {e}")
+
 def get_video_duration(video_path):
-    """使用 ffprobe 获取视频时长（秒）"""
+    """获取视频时长（秒），结果按文件大小和修改时间缓存"""
+    key = _probe_cache_key('duration', video_path)
+    if key in _PROBE_CACHE:
+        return _PROBE_CACHE[key]
+    duration = _probe_video_duration(video_path)
+    # 失败结果不缓存，下次重新探测
+    if key is not None and duration > 0:
+        _PROBE_CACHE[key] = duration
+    return duration
+
+def _probe_video_duration(video_path):
+    """探测视频时长（秒），优先使用PyAV，不可用或失败时回退到ffprobe"""
+    if av is not None:
+        try:
+            with av.open(video_path, metadata_errors='ignore') as container:
+                if container.duration:
+                    return float(container.duration) / av.time_base
+        except Exception as e:
+            # 与ffprobe路径一致，任何PyAV错误都不中断扫描
+            print(f"PyAV读取视频时长失败，回退到ffprobe {video_path}: {e}")
     try:
         cmd = [
             'ffprobe', '-v', 'error', '-show_entries', 'format=duration',
@@ -43,32 +140,83 @@ def get_video_duration(video_path):
         # 返回一个默认值或引发异常可能更好，这里返回 0 以便后续逻辑处理
         return 0 
 
-def cut_video(input_path, output_path, start_time, duration):
-    """使用ffmpeg剪切视频，优先使用无损复制，失败则尝试高质量编码"""
+def _cut_command(input_path, output_path, start_time, duration, codec_args):
+    """构建剪辑命令，codec_args为编码相关参数"""
+    return [
+        'ffmpeg', '-i', input_path,
+        '-ss', str(start_time),
+        '-t', str(duration),
+        *codec_args,
+        '-avoid_negative_ts', 'make_zero',
+        '-movflags', '+faststart',  # moov前置，便于播放器和编辑软件快速打开
+        '-y',
+        output_path
+    ]
+
+def _cut_codec_args(encoder):
+    """根据编码器返回剪辑所用的编码参数
+
+    Args:
+        encoder: 'copy'、'h264_nvenc'、'hevc_nvenc' 或 'libx264'
+    """
+    if encoder == 'copy':
+        return ['-c', 'copy']  # 直接复制流，不重新编码
+    if encoder in ('h264_nvenc', 'hevc_nvenc'):
+        multipass = ['-multipass', HEVC_NVENC_MULTIPASS] if encoder == 'hevc_nvenc' else []
+        return [
+            '-c:v', encoder,
+            '-preset', GPU_ENCODE_PRESET,
+            '-tune', GPU_ENCODE_TUNE,
+            *multipass,
+            '-rc', 'vbr',
+            '-cq', CQ_VALUE,
+            '-b:v', VIDEO_BITRATE,
+            '-maxrate', MAX_BITRATE,
+            '-bufsize', BUFFER_SIZE,
+            '-c:a', 'copy',  # 保持原始音频
+            '-map_metadata', '-1',
+        ]
+    return [
+        '-c:v', 'libx264',
+        '-preset', CPU_ENCODE_PRESET,
+        '-crf', CRF_VALUE,
+        '-b:v', VIDEO_BITRATE,
+        '-maxrate', MAX_BITRATE,
+        '-bufsize', BUFFER_SIZE,
+        '-c:a', 'copy',  # 保持原始音频
+        '-map_metadata', '-1',
+    ]
+
+async def _run_ffmpeg_async(cmd):
+    """异步执行ffmpeg命令，失败时抛出CalledProcessError"""
+    process = await asyncio.create_subprocess_exec(
+        *_quiet_command(cmd), stdout=asyncio.subprocess.DEVNULL, stderr=asyncio.subprocess.PIPE,
+        startupinfo=get_startupinfo())
+    _, stderr = await process.communicate()
+    if process.returncode != 0:
+        raise subprocess.CalledProcessError(process.returncode, cmd, None, stderr)
+
+async def _cut_video_async(input_path, output_path, start_time, duration, available_encoders=None):
+    """剪辑单个视频片段，优先使用无损复制，失败则尝试高质量编码
+
+    Args:
+        available_encoders: 预先检测的可用编码器列表，为None时按需检测
+    """
     if duration <= 0:
         print(f"剪辑时间无效 (<=0): {duration} for {input_path}. 跳过剪辑。")
         return False
     try:
         # 首先尝试无损复制
         print(f"  尝试无损复制剪辑...")
-        copy_cmd = [
-            'ffmpeg', '-i', input_path,
-            '-ss', str(start_time),
-            '-t', str(duration),
-            '-c', 'copy',  # 直接复制流，不重新编码
-            '-avoid_negative_ts', 'make_zero',
-            '-y',
-            output_path
-        ]
+        copy_cmd = _cut_command(input_path, output_path, start_time, duration, _cut_codec_args('copy'))
         
         try:
             print(f"  执行无损复制: {' '.join(copy_cmd)}")
-            subprocess.run(copy_cmd, check=True, capture_output=True, text=True, encoding='utf-8',
-                         startupinfo=get_startupinfo())
+            await _run_ffmpeg_async(copy_cmd)
             print(f"  无损复制成功: {output_path}")
             return True
         except subprocess.CalledProcessError as e:
-            print(f"  无损复制失败，尝试高质量编码: {e}")
+            print(f"  无损复制失败，尝试高质量编码: {_ffmpeg_error(e)}")
         
         # 如果无损复制失败，尝试高质量编码
         # 检查是否强制使用CPU编码
@@ -77,90 +225,175 @@ def cut_video(input_path, output_path, start_time, duration):
             raise ValueError("强制使用CPU编码")
             
         # 检查可用的编码器
-        available_encoders = check_encoder_availability()
+        if available_encoders is None:
+            available_encoders = check_encoder_availability()
         
         # 根据可用编码器选择命令
         if "h264_nvenc" in available_encoders:
             # 使用 NVIDIA H.264 编码
             print(f"  使用NVIDIA H.264硬件加速剪辑...")
-            cmd = [
-                'ffmpeg', '-i', input_path,
-                '-ss', str(start_time),
-                '-t', str(duration),
-                '-c:v', 'h264_nvenc',
-                '-preset', GPU_ENCODE_PRESET,
-                '-rc', 'vbr',
-                '-cq', CQ_VALUE,
-                '-b:v', VIDEO_BITRATE,
-                '-maxrate', MAX_BITRATE,
-                '-bufsize', BUFFER_SIZE,
-                '-c:a', 'copy',  # 保持原始音频
-                '-map_metadata', '-1',
-                '-avoid_negative_ts', 'make_zero',
-                '-y',
-                output_path
-            ]
+            cmd = _cut_command(input_path, output_path, start_time, duration, _cut_codec_args('h264_nvenc'))
         elif "hevc_nvenc" in available_encoders:
             # 使用 NVIDIA HEVC 编码 (H.265)
             print(f"  使用NVIDIA HEVC硬件加速剪辑...")
-            cmd = [
-                'ffmpeg', '-i', input_path,
-                '-ss', str(start_time),
-                '-t', str(duration),
-                '-c:v', 'hevc_nvenc',
-                '-preset', GPU_ENCODE_PRESET,
-                '-rc', 'vbr',
-                '-cq', CQ_VALUE,
-                '-b:v', VIDEO_BITRATE,
-                '-maxrate', MAX_BITRATE,
-                '-bufsize', BUFFER_SIZE,
-                '-c:a', 'copy',  # 保持原始音频
-                '-map_metadata', '-1',
-                '-avoid_negative_ts', 'make_zero',
-                '-y',
-                output_path
-            ]
+            cmd = _cut_command(input_path, output_path, start_time, duration, _cut_codec_args('hevc_nvenc'))
         else:
             # 没有可用的GPU编码器，使用CPU
             raise ValueError("未检测到支持的GPU编码器，使用CPU编码")
         
         print(f"  尝试高质量编码: {' '.join(cmd)}")
-        subprocess.run(cmd, check=True, capture_output=True, text=True, encoding='utf-8',
-                     startupinfo=get_startupinfo())
+        await _run_ffmpeg_async(cmd)
         print(f"  高质量编码成功: {output_path}")
         return True
     except (subprocess.CalledProcessError, ValueError) as e:
         print(f"GPU编码失败或不可用: {e}")
         print("  尝试使用CPU高质量编码...")
         try:
-            cmd_cpu = [
-                'ffmpeg', '-i', input_path,
-                '-ss', str(start_time),
-                '-t', str(duration),
-                '-c:v', 'libx264',
-                '-preset', CPU_ENCODE_PRESET,
-                '-crf', CRF_VALUE,
-                '-b:v', VIDEO_BITRATE,
-                '-maxrate', MAX_BITRATE,
-                '-bufsize', BUFFER_SIZE,
-                '-c:a', 'copy',  # 保持原始音频
-                '-map_metadata', '-1',
-                '-avoid_negative_ts', 'make_zero',
-                '-y',
-                output_path
-            ]
+            cmd_cpu = _cut_command(input_path, output_path, start_time, duration, _cut_codec_args('libx264'))
             print(f"  尝试CPU高质量编码: {' '.join(cmd_cpu)}")
-            subprocess.run(cmd_cpu, check=True, capture_output=True, text=True, encoding='utf-8',
-                         startupinfo=get_startupinfo())
+            await _run_ffmpeg_async(cmd_cpu)
             print(f"  CPU高质量编码成功: {output_path}")
             return True
         except subprocess.CalledProcessError as e_cpu:
-            print(f"CPU编码也失败了 {input_path}: {e_cpu}")
+            print(f"CPU编码也失败了 {input_path}: {_ffmpeg_error(e_cpu)}")
             return False
     except Exception as ex:
          print(f"剪辑过程中发生未知错误 {input_path}: {ex}")
          return False
 
+def cut_video(input_path, output_path, start_time, duration):
+    """使用ffmpeg剪切视频，优先使用无损复制，失败则尝试高质量编码
+    
+    供脚本调用的库函数，process_videos的区间导出不经过此函数。
+    """
+    return asyncio.run(_cut_video_async(input_path, output_path, start_time, duration))
+
+def cut_videos_batch(jobs, max_parallel=None):
+    """并行剪辑多个视频片段
+    
+    多个ffmpeg进程同时运行，使一个片段的解码读盘与另一个片段的编码重叠；
+    NVENC支持多路并发编码会话，CPU编码也可随核心数近线性扩展。
+    
+    供脚本调用的库函数，process_videos的区间导出不经过此函数。
+    
+    Args:
+        jobs: (input_path, output_path, start_time, duration) 元组列表
+        max_parallel: 最大并发ffmpeg进程数，默认为CPU核心数的一半
+        
+    Returns:
+        List[bool]: 与jobs顺序对应的剪辑结果
+    """
+    jobs = list(jobs)
+    if not jobs:
+        return []
+    
+    if max_parallel is None:
+        max_parallel = max(1, (os.cpu_count() or 2) // 2)
+    
+    # 所有片段共用一次编码器检测结果
+    available_encoders = [] if ENFORCE_CPU_ENCODE else check_encoder_availability()
+    
+    async def _run_all():
+        semaphore = asyncio.Semaphore(max_parallel)
+        
+        async def _run_one(job):
+            async with semaphore:
+                return await _cut_video_async(*job, available_encoders=available_encoders)
+        
+        return await asyncio.gather(*(_run_one(job) for job in jobs))
+    
+    print(f"开始并行剪辑 {len(jobs)} 个片段 (最大并发数: {max_parallel})")
+    return list(asyncio.run(_run_all()))
+
+def _cut_many_command(input_path, clips, codec_args):
+    """构建单次调用输出多个片段的剪辑命令，输入只打开一次
+
+    Args:
+        clips: (start_time, duration, output_path) 元组列表
+    """
+    cmd = ['ffmpeg', '-i', input_path]
+    for start_time, duration, output_path in clips:
+        # 输出选项写在各自的输出文件之前，仅作用于该输出
+        cmd.extend([
+            '-ss', str(start_time),
+            '-t', str(duration),
+            *codec_args,
+            '-avoid_negative_ts', 'make_zero',
+            '-movflags', '+faststart',
+            '-y',
+            output_path
+        ])
+    return cmd
+
+def cut_video_many(input_path, clips, max_parallel=None):
+    """从同一个源视频中剪辑多个片段
+    
+    先尝试用一次ffmpeg调用输出全部片段（解码器初始化、输入探测和编码会话只做一次），
+    依次尝试无损复制和高质量编码；都失败时回退到逐片段并行剪辑。
+    
+    供脚本调用的库函数，process_videos的区间导出不经过此函数。
+    
+    Args:
+        input_path: 源视频路径
+        clips: (start_time, duration, output_path) 元组列表
+        max_parallel: 回退到逐片段剪辑时的最大并发数
+        
+    Returns:
+        List[bool]: 与clips顺序对应的剪辑结果
+    """
+    clips = list(clips)
+    results = [False] * len(clips)
+    valid = []
+    for index, (start_time, duration, output_path) in enumerate(clips):
+        if duration <= 0:
+            print(f"剪辑时间无效 (<=0): {duration} for {input_path}. 跳过剪辑。")
+            continue
+        valid.append(index)
+    if not valid:
+        return results
+    
+    valid_clips = [clips[i] for i in valid]
+    
+    # 1. 一次调用无损复制所有片段
+    copy_cmd = _cut_many_command(input_path, valid_clips, _cut_codec_args('copy'))
+    try:
+        print(f"  单次调用无损复制 {len(valid_clips)} 个片段: {' '.join(copy_cmd)}")
+        _run_ffmpeg(copy_cmd)
+        print(f"  无损复制成功")
+        for i in valid:
+            results[i] = True
+        return results
+    except subprocess.CalledProcessError as e:
+        print(f"  单次调用无损复制失败，尝试高质量编码: {_ffmpeg_error(e)}")
+    
+    # 2. 一次调用高质量编码所有片段，共用同一个编码会话
+    available_encoders = [] if ENFORCE_CPU_ENCODE else check_encoder_availability()
+    if "h264_nvenc" in available_encoders:
+        encoder = 'h264_nvenc'
+    elif "hevc_nvenc" in available_encoders:
+        encoder = 'hevc_nvenc'
+    else:
+        encoder = 'libx264'
+    encode_cmd = _cut_many_command(input_path, valid_clips, _cut_codec_args(encoder))
+    try:
+        print(f"  单次调用高质量编码 ({encoder}): {' '.join(encode_cmd)}")
+        _run_ffmpeg(encode_cmd)
+        print(f"  高质量编码成功")
+        for i in valid:
+            results[i] = True
+        return results
+    except subprocess.CalledProcessError as e:
+        print(f"  单次调用高质量编码失败，回退到逐片段剪辑: {_ffmpeg_error(e)}")
+    
+    # 3. 回退：逐片段剪辑，各自按原有流程尝试
+    batch_results = cut_videos_batch(
+        [(input_path, output_path, start_time, duration) for start_time, duration, output_path in valid_clips],
+        max_parallel=max_parallel
+    )
+    for i, ok in zip(valid, batch_results):
+        results[i] = ok
+    return results
+
 def concat_videos(video_list, output_path, temp_dir=None, remove_duplicates=None):
     """使用ffmpeg合并视频，重新编码以确保兼容性，并可选择去除重复帧
     
@@ -196,21 +429,26 @@ def concat_videos(video_list, output_path, temp_dir=None, remove_duplicates=None
     valid_inputs = []
     
     try:
-        # 检查输入文件是否存在且非空
-        with open(list_file, 'w', encoding='utf-8') as f:
-            for video in video_list:
-                if os.path.exists(video) and os.path.getsize(video) > 100: # 增加一个最小大小检查
-                    # 先处理路径，再放入 f-string
-                    normalized_path = os.path.abspath(video).replace('\\', '/')
-                    f.write(f"file '{normalized_path}'\n")
-                    valid_inputs.append(video)
-                else:
-                    print(f"警告：跳过无效或过小的临时文件 {video}")
+        # 检查输入文件是否存在且非空，每个文件只调用一次 os.stat
+        for video in video_list:
+            try:
+                size = os.stat(video).st_size
+            except OSError:
+                size = 0
+            if size > 100: # 增加一个最小大小检查
+                valid_inputs.append(video)
+            else:
+                print(f"警告：跳过无效或过小的临时文件 {video}")
 
         if not valid_inputs:
             print("没有有效的临时文件可供合并。")
             return False
 
+        # 在内存中构建完整列表，一次性写入
+        lines = [f"file '{os.path.abspath(video).replace(os.sep, '/')}'\n" for video in valid_inputs]
+        with open(list_file, 'w', encoding='utf-8') as f:
+            f.write("".join(lines))
+
         # 首先合并视频到一个中间文件，不做去重处理
         intermediate_file = os.path.join(temp_dir, f'intermediate_{os.getpid()}_{int(time.time())}.mp4')
         
@@ -227,23 +465,28 @@ def concat_videos(video_list, output_path, temp_dir=None, remove_duplicates=None
         
         print(f"第一步：简单合并视频到临时文件: {' '.join(base_concat_cmd)}")
         try:
-            subprocess.run(base_concat_cmd, check=True, capture_output=True, text=True, encoding='utf-8',
-                          startupinfo=get_startupinfo())
+            _run_ffmpeg(base_concat_cmd)
             print(f"简单合并成功: {intermediate_file}")
         except subprocess.CalledProcessError as e:
-            print(f"简单合并失败: {e}")
+            print(f"简单合并失败: {_ffmpeg_error(e)}")
             return False
             
         # 然后，如果启用去重帧功能，对中间文件进行处理
         if remove_duplicates:
             return _process_duplicate_removal(intermediate_file, output_path, temp_dir)
         else:
-            # 如果不去重帧，直接复制中间文件
-            print(f"不进行去重，直接复制中间文件到目标位置")
+            # 如果不去重帧，直接将中间文件移动到目标位置
+            print(f"不进行去重，直接移动中间文件到目标位置")
             try:
-                import shutil
-                shutil.copy2(intermediate_file, output_path)
-                print(f"文件复制成功: {output_path}")
+                try:
+                    # 同一分区内只是重命名，无需复制文件内容
+                    os.replace(intermediate_file, output_path)
+                    print(f"文件移动成功: {output_path}")
+                except OSError:
+                    # 跨分区等情况无法重命名，回退到复制
+                    import shutil
+                    shutil.copy2(intermediate_file, output_path)
+                    print(f"文件复制成功: {output_path}")
                 return True
             except Exception as e_copy:
                 print(f"复制文件失败: {e_copy}")
@@ -253,7 +496,7 @@ def concat_videos(video_list, output_path, temp_dir=None, remove_duplicates=None
         # 清理临时文件
         cleanup_temp_files(temp_dir, [
             intermediate_file, list_file,
-            f"{temp_dir}/scenes.txt", f"{temp_dir}/freeze.txt"
+            f"{temp_dir}/freeze.txt"
         ])
 
 def _process_duplicate_removal(intermediate_file, output_path, temp_dir):
@@ -276,39 +519,19 @@ def _process_duplicate_removal(intermediate_file, output_path, temp_dir):
             'ffmpeg',
             '-i', intermediate_file,
             '-c', 'copy',
+            '-movflags', '+faststart',
             '-y',
             output_path
         ]
         print(f"  执行无损复制: {' '.join(copy_cmd)}")
-        subprocess.run(copy_cmd, check=True, capture_output=True, text=True, encoding='utf-8',
-                     startupinfo=get_startupinfo())
+        _run_ffmpeg(copy_cmd)
         print(f"  无损复制成功: {output_path}")
         return True
     except subprocess.CalledProcessError as e:
-        print(f"  无损复制失败，尝试高质量编码: {e}")
+        print(f"  无损复制失败，尝试高质量编码: {_ffmpeg_error(e)}")
     
     # 如果无损复制失败，尝试高质量编码
-    # 使用scene检测+基于哈希的去重方法
-    # 1. 创建场景检测命令
-    scene_filter = f"select='gt(scene,{SCENE_CHANGE_THRESHOLD})',metadata=print:file='{temp_dir}/scenes.txt'"
-    frame_info_cmd = [
-        'ffmpeg',
-        '-i', intermediate_file,
-        '-vf', scene_filter,
-        '-f', 'null',
-        '-'
-    ]
-    
-    print(f"检测场景变化: {' '.join(frame_info_cmd)}")
-    try:
-        subprocess.run(frame_info_cmd, check=True, capture_output=True, text=True, encoding='utf-8',
-                      startupinfo=get_startupinfo())
-        print(f"场景检测完成")
-    except subprocess.CalledProcessError as e:
-        print(f"场景检测失败: {e}")
-        # 继续执行，使用备用方法
-    
-    # 2. 使用较复杂的过滤器组合去重
+    # 使用冻结帧检测+mpdecimate的过滤器组合去重
     filter_complex = [
         '-filter_complex', 
         f'[0:v]freezedetect=n={FREEZE_DETECT_NOISE}:d={FREEZE_DETECT_DURATION},metadata=mode=print:file={temp_dir}/freeze.txt,mpdecimate=hi={DUPLICATE_THRESHOLD_HI}:lo={DUPLICATE_THRESHOLD_LO}:frac={DUPLICATE_FRACTION},setpts=N/FRAME_RATE/TB[v];[0:a]asetpts=N/SR/TB[a]',
@@ -318,13 +541,18 @@ def _process_duplicate_removal(intermediate_file, output_path, temp_dir):
     
     # 检查可用编码器
     available_encoders = check_encoder_availability()
-    encode_type = "CPU" if ENFORCE_CPU_ENCODE or not available_encoders.get("h264_nvenc", False) else "GPU"
+    encode_type = "CPU" if ENFORCE_CPU_ENCODE or "h264_nvenc" not in available_encoders else "GPU"
+    
+    # GPU编码时使用NVDEC硬件解码，解码后的帧交给CPU过滤器（mpdecimate/freezedetect）处理，
+    # 保持原分辨率输出；NVDEC不可用时ffmpeg会自动回退到软件解码
+    hwaccel_args = ['-hwaccel', 'cuda'] if encode_type == "GPU" and USE_NVDEC_DECODE else []
     
     # 根据编码类型选择参数
     if encode_type == "GPU":
         encode_params = [
             '-c:v', 'h264_nvenc',
             '-preset', GPU_ENCODE_PRESET,
+            '-tune', GPU_ENCODE_TUNE,
             '-cq', CQ_VALUE,
             '-b:v', VIDEO_BITRATE,
             '-maxrate', MAX_BITRATE,
@@ -345,57 +573,59 @@ def _process_duplicate_removal(intermediate_file, output_path, temp_dir):
     # 构建完整的去重命令
     dedup_cmd = [
         'ffmpeg',
+        *hwaccel_args,
         '-i', intermediate_file,
         *filter_complex,
         *encode_params,
         '-c:a', 'copy',  # 保持原始音频
+        '-movflags', '+faststart',
         '-y',
         output_path
     ]
     
     print(f"执行高质量编码: {' '.join(dedup_cmd)}")
     try:
-        subprocess.run(dedup_cmd, check=True, capture_output=True, text=True, encoding='utf-8',
-                      startupinfo=get_startupinfo())
+        _run_ffmpeg(dedup_cmd)
         print(f"高质量编码成功: {output_path}")
         return True
     except subprocess.CalledProcessError as e:
-        print(f"高质量编码失败: {e}")
+        print(f"高质量编码失败: {_ffmpeg_error(e)}")
         # 尝试备用方法
         try:
             # 使用更简单的过滤器
             simple_filter_cmd = [
                 'ffmpeg',
+                *hwaccel_args,
                 '-i', intermediate_file,
                 '-vf', f'mpdecimate=hi={DUPLICATE_THRESHOLD_HI}:lo={DUPLICATE_THRESHOLD_LO}:frac={DUPLICATE_FRACTION},setpts=N/FRAME_RATE/TB',
                 *encode_params,
                 '-c:a', 'copy',  # 保持原始音频
+                '-movflags', '+faststart',
                 '-y',
                 output_path
             ]
             print(f"尝试简单高质量编码: {' '.join(simple_filter_cmd)}")
-            subprocess.run(simple_filter_cmd, check=True, capture_output=True, text=True, encoding='utf-8',
-                          startupinfo=get_startupinfo())
+            _run_ffmpeg(simple_filter_cmd)
             print(f"简单高质量编码成功: {output_path}")
             return True
         except subprocess.CalledProcessError as e_simple:
-            print(f"简单高质量编码失败: {e_simple}")
+            print(f"简单高质量编码失败: {_ffmpeg_error(e_simple)}")
             # 最后尝试直接复制
             try:
                 copy_cmd = [
                     'ffmpeg',
                     '-i', intermediate_file,
                     '-c', 'copy',
+                    '-movflags', '+faststart',
                     '-y',
                     output_path
                 ]
                 print(f"尝试直接复制流: {' '.join(copy_cmd)}")
-                subprocess.run(copy_cmd, check=True, capture_output=True, text=True, encoding='utf-8',
-                            startupinfo=get_startupinfo())
+                _run_ffmpeg(copy_cmd)
                 print(f"流复制成功: {output_path}")
                 return True
             except subprocess.CalledProcessError as e_copy:
-                print(f"所有尝试都失败了: {e_copy}")
+                print(f"所有尝试都失败了: {_ffmpeg_error(e_copy)}")
                 return False
 
 def cleanup_temp_files(temp_dir, file_list):
@@ -490,7 +720,7 @@ def check_encoder_availability():
     return available_encoders 
 
 def get_video_info(video_path):
-    """使用 ffprobe 获取视频信息，包括分辨率、码率、时长等
+    """获取视频信息，包括分辨率、码率、时长等（优先使用PyAV，回退到ffprobe）
     
     Args:
         video_path: 视频文件路径
@@ -503,6 +733,56 @@ def get_video_info(video_path):
             - bitrate: 视频码率(bps)
             - framerate: 帧率
     """
+    key = _probe_cache_key('info', video_path)
+    if key in _PROBE_CACHE:
+        return dict(_PROBE_CACHE[key])
+    
+    info = None
+    if av is not None:
+        info = _get_video_info_av(video_path)
+    if info is None:
+        info = _get_video_info_ffprobe(video_path)
+    if info is not None:
+        print(f"获取视频信息成功: 分辨率={info['width']}x{info['height']}, 码率={info['bitrate']/1000 if info['bitrate'] else 'unknown'}kbps")
+        if key is not None:
+            _PROBE_CACHE[key] = dict(info)
+    return info
+
+def _get_video_info_av(video_path):
+    """使用PyAV在进程内读取视频信息，失败返回None"""
+    try:
+        with av.open(video_path, metadata_errors='ignore') as container:
+            info = {
+                'width': None,
+                'height': None,
+                'duration': None,
+                'bitrate': None,
+                'framerate': None
+            }
+            if container.streams.video:
+                stream = container.streams.video[0]
+                info['width'] = stream.width or None
+                info['height'] = stream.height or None
+                if stream.average_rate:
+                    info['framerate'] = round(float(stream.average_rate), 3)
+                if stream.bit_rate:
+                    info['bitrate'] = int(stream.bit_rate)
+                if stream.duration is not None and stream.time_base:
+                    info['duration'] = float(stream.duration * stream.time_base)
+            
+            # 流中缺失的信息从容器获取
+            if not info['bitrate'] and container.bit_rate:
+                info['bitrate'] = int(container.bit_rate)
+            if not info['duration'] and container.duration:
+                info['duration'] = float(container.duration) / av.time_base
+            return info
+    except Exception as e:
+        # 与ffprobe路径一致，任何PyAV错误都不中断扫描
+        print(f"PyAV读取视频信息失败，回退到ffprobe {video_path}: {e}")
+        return None
+
+def _get_video_info_ffprobe(video_path):
+    """使用 ffprobe 获取视频信息，失败返回None"""
     try:
         cmd = [
             'ffprobe', 
@@ -514,10 +794,11 @@ def get_video_info(video_path):
             video_path
         ]
         
-        result = subprocess.run(cmd, check=True, capture_output=True, text=True, 
+        # 以bytes形式读取输出，省去解码为str的开销
+        result = subprocess.run(cmd, check=True, capture_output=True,
                                startupinfo=get_startupinfo())
         
-        data = json.loads(result.stdout)
+        data = _json_loads(result.stdout)
         
         # 初始化返回结果
         info = {
@@ -574,8 +855,7 @@ def get_video_info(video_path):
                     info['duration'] = float(data['format']['duration'])
                 except (ValueError, TypeError):
                     pass
-                
-        print(f"获取视频信息成功: 分辨率={info['width']}x{info['height']}, 码率={info['bitrate']/1000 if info['bitrate'] else 'unknown'}kbps")
+
         return info
         
     except (subprocess.CalledProcessError, FileNotFoundError, json.JSONDecodeError) as e:
@@ -606,7 +886,7 @@ def extract_audio(input_path, output_path, audio_format='mp3'):
             output_path
         ]
         print(f"提取音频: {' '.join(cmd)}")
-        subprocess.run(cmd, check=True, capture_output=True, text=True, encoding='utf-8', startupinfo=get_startupinfo())
+        _run_ffmpeg(cmd)
         print(f"音频提取成功: {output_path}")
         return True
     except Exception as e:
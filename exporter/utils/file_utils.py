@@ -11,6 +11,11 @@ from datetime import datetime, timedelta
 
 from exporter.utils.constants import STATE_FILE
 
+# 录像文件名模式：日期、时间，以及可选的毫秒/ID部分
+_VIDEO_NAME_RE = re.compile(
+    r"War Thunder (\d{4}\.\d{2}\.\d{2}) - (\d{2}\.\d{2}\.\d{2})(?:\.(\d+)\.DVR\.mp4)?"
+)
+
 def convert_windows_path(path):
     """将Windows路径转换为Python程序能识别的路径"""
     return path.replace('\\', '/')
@@ -23,22 +28,19 @@ def parse_video_time(filename):
     - War Thunder 2025.04.14 - 14.00.35.105.DVR.mp4 (新格式)
     - War Thunder 2025.04.12 - 20.01.55.06.DVR.mp4  (另一种格式)
     """
-    # 提取基本日期和时间部分的通用模式
-    base_pattern = r"War Thunder (\d{4}\.\d{2}\.\d{2}) - (\d{2}\.\d{2}\.\d{2})"
-    base_match = re.match(base_pattern, filename)
+    # 一次匹配同时提取日期、基本时间和毫秒/ID部分（如果存在）
+    match = _VIDEO_NAME_RE.match(filename)
     
-    if not base_match:
+    if not match:
         print(f"无法解析文件名基本格式: {filename}")
         return None
     
-    # 获取日期和基本时间部分
-    date_str, base_time = base_match.groups()
-    
-    # 尝试提取毫秒/ID部分（如果存在）
-    ms_pattern = r"War Thunder \d{4}\.\d{2}\.\d{2} - \d{2}\.\d{2}\.\d{2}\.(\d+)\.DVR\.mp4"
-    ms_match = re.match(ms_pattern, filename)
-    
-    ms_part = ms_match.group(1) if ms_match else ""
+    return _build_dt(match, filename)
+
+def _build_dt(match, filename):
+    """根据文件名正则匹配结果构建datetime，失败返回None"""
+    date_str, base_time, ms_part = match.groups()
+    ms_part = ms_part or ""
     
     try:
         # 将点替换为冒号来格式化时间
@@ -65,6 +67,38 @@ def parse_video_time(filename):
             print(f"解析时间字符串失败 '{filename}': {e}")
             return None
 
+def iter_new_videos(dirpath, since=None, ignore_case=False):
+    """扫描目录，逐个返回可解析时间且晚于since的录像文件
+    
+    使用 os.scandir 一次遍历目录，文件名只做一次正则匹配，
+    早于或等于since的文件直接跳过，不做任何额外的文件系统调用。
+    与原先的扫描一致，默认只处理扩展名为小写.mp4的文件，无法解析时间的文件会打印跳过信息。
+    
+    Args:
+        dirpath: 录像所在目录
+        since: 上次处理到的时间，为None时返回全部录像
+        ignore_case: 为True时扩展名不区分大小写（.MP4也会返回）
+        
+    Yields:
+        (path, filename, datetime) 元组
+    """
+    with os.scandir(dirpath) as entries:
+        for entry in entries:
+            name = entry.name
+            ext = name[-4:].lower() if ignore_case else name[-4:]
+            if ext != ".mp4" or not entry.is_file():
+                continue
+            match = _VIDEO_NAME_RE.match(name)
+            if not match:
+                print(f"无法解析文件名基本格式: {name}")
+            dt = _build_dt(match, name) if match else None
+            if dt is None:
+                print(f"  跳过: 无法解析时间 {name}")
+                continue
+            if since and dt <= since:
+                continue
+            yield entry.path, name, dt
+
 def load_last_processed_time(state_file=None):
     """加载上次处理的最新视频时间"""
     # 使用自定义状态文件路径或默认值
@@ -0,0 +1,43 @@
+import os
+import sys
+import tempfile
+import unittest
+from datetime import datetime
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from exporter.utils.file_utils import iter_new_videos
+
+class IterNewVideosTest(unittest.TestCase):
+    """iter_new_videos的扩展名过滤"""
+
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.dir = self._tmp.name
+        for name in ("War Thunder 2025.04.14 - 14.00.35.105.DVR.mp4",
+                     "War Thunder 2025.04.14 - 14.00.36.1.DVR.MP4",
+                     "random.mp4"):
+            open(os.path.join(self.dir, name), "w").close()
+
+    def tearDown(self):
+        self._tmp.cleanup()
+
+    def _names(self, **kwargs):
+        return sorted(name for _, name, _ in iter_new_videos(self.dir, **kwargs))
+
+    def test_default_skips_upper_case_extension(self):
+        self.assertEqual(self._names(), ["War Thunder 2025.04.14 - 14.00.35.105.DVR.mp4"])
+
+    def test_ignore_case_includes_upper_case_extension(self):
+        self.assertEqual(self._names(ignore_case=True), [
+            "War Thunder 2025.04.14 - 14.00.35.105.DVR.mp4",
+            "War Thunder 2025.04.14 - 14.00.36.1.DVR.MP4",
+        ])
+
+    def test_since_filters_older_videos(self):
+        since = datetime(2025, 4, 14, 14, 0, 35, 500000)
+        self.assertEqual(self._names(since=since, ignore_case=True),
+                         ["War Thunder 2025.04.14 - 14.00.36.1.DVR.MP4"])
+
+if __name__ == "__main__":
+    unittest.main()
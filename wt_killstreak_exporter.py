@@ -9,21 +9,30 @@ import os
 import sys
 import json
 import time
+import queue
 import logging
+import logging.handlers
 import threading
-from datetime import datetime
+import subprocess
+from collections import deque
+from enum import IntEnum
+from functools import lru_cache
 from pathlib import Path
 
 # PyQt5和PyQt-Fluent-Widgets库
-from PyQt5.QtCore import Qt, QThread, pyqtSignal, QSettings, QSize, QUrl, QTimer, QStandardPaths
-from PyQt5.QtGui import QIcon, QFont, QDesktopServices, QPixmap
-from PyQt5.QtWidgets import QApplication, QFileDialog, QWidget, QHBoxLayout, QVBoxLayout, QFrame, QLabel, QGridLayout, QCheckBox, QSizePolicy, QDialog
+from PyQt5.QtCore import (
+    Qt, QThread, pyqtSignal, pyqtSlot, QSettings, QSize, QTimer, QStandardPaths,
+    QObject, QRunnable, QThreadPool, QByteArray
+)
+from PyQt5 import sip
+from PyQt5.QtGui import QIcon, QFont, QPixmap
+from PyQt5.QtWidgets import QApplication, QFileDialog, QWidget, QHBoxLayout, QVBoxLayout, QFrame, QLabel, QGridLayout, QCheckBox, QSizePolicy, QDialog, QSplitter
 
 # 导入Fluent Widgets组件
 from qfluentwidgets import (
     MessageBox, InfoBarPosition, InfoBar, PrimaryPushButton, 
     PushButton, ComboBox, SpinBox, setTheme, Theme, ProgressBar,
-    ToolButton, LineEdit, TextEdit, 
+    ToolButton, LineEdit, PlainTextEdit, 
     FluentIcon as FIF, SubtitleLabel, CardWidget, StrongBodyLabel, BodyLabel,
     ScrollArea, TitleLabel, SimpleCardWidget
 )
@@ -38,12 +47,20 @@ except ImportError:
     # 如果失败，使用旧版本的接口
     from qfluentwidgets.components.widgets.info_bar import InfoBar as InfoBarManager
 
-# 导入处理模块
-import exporter
-from exporter.core.processor import process_videos
+# 导入处理模块（视频处理模块在首次开始处理时才导入，加快窗口显示）
+from exporter._version import __version__
+from exporter.utils.constants import TYPICAL_VIDEO_LENGTH
+process_videos = None
+
+def _ensure_exporter():
+    """首次使用时导入视频处理模块"""
+    global process_videos
+    if process_videos is None:
+        from exporter.core.processor import process_videos as _process_videos
+        process_videos = _process_videos
 
 # 获取程序版本
-VERSION = exporter.__version__
+VERSION = __version__
 
 # 设置日志
 logging.basicConfig(
@@ -53,10 +70,157 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+LOG_FILE_BUFFER = 64 * 1024  # 应用日志文件写缓冲区大小（字节）
+LOG_FILE_SYNC_INTERVAL = 1.0  # 应用日志文件写入磁盘的最小间隔（秒）
+
+class BufferedFileHandler(logging.StreamHandler):
+    """带大写缓冲区的日志文件处理器
+    
+    StreamHandler每条记录后都会flush，这里改为积累在文件缓冲区中，
+    距上次写入磁盘超过LOG_FILE_SYNC_INTERVAL时再写入，关闭时写入剩余内容。
+    运行在日志监听线程中，界面线程不会等待磁盘。
+    """
+    def __init__(self, filename, buffer_size=LOG_FILE_BUFFER):
+        super().__init__(open(filename, 'a', encoding='utf-8', buffering=buffer_size))
+        self._last_sync = time.monotonic()
+    
+    def emit(self, record):
+        super().emit(record)
+        if time.monotonic() - self._last_sync >= LOG_FILE_SYNC_INTERVAL:
+            self.sync()
+    
+    def flush(self):
+        # 每条记录后不写入磁盘
+        pass
+    
+    def sync(self):
+        """将缓冲区中的日志写入磁盘"""
+        with self.lock:
+            if self.stream and not self.stream.closed:
+                self.stream.flush()
+            self._last_sync = time.monotonic()
+    
+    def close(self):
+        with self.lock:
+            try:
+                if self.stream and not self.stream.closed:
+                    self.stream.flush()
+                    self.stream.close()
+            finally:
+                super().close()
+
+# 应用日志文件处理器，程序启动时创建
+file_log_handler = None
+
 # 路径常量
 APP_NAME = "连杀导出工具"
 ORG_NAME = "WTKillStreakExporter"
 
+# 日志显示参数
+LOG_FLUSH_INTERVAL = 50  # 日志批量写入间隔（毫秒）
+LOG_MAX_BLOCKS = 5000  # 日志框默认最多保留的行数（可在设置中修改）
+LOG_DRAIN_INTERVAL = 50  # 处理日志队列的读取间隔（毫秒）
+LOG_DRAIN_BATCH = 500  # 每次最多读取的处理日志条数
+PROGRESS_EMIT_INTERVAL = 0.033  # 进度通知的最小间隔（秒），约30次/秒
+
+# 处理日志队列：处理线程写入，界面线程定时读取
+LOG_QUEUE = queue.Queue()
+
+class QueueLogHandler(logging.Handler):
+    """将日志记录格式化后放入队列，由界面线程定时取出显示"""
+    def __init__(self, log_queue):
+        super().__init__()
+        self.log_queue = log_queue
+    
+    def emit(self, record):
+        try:
+            self.log_queue.put_nowait(self.format(record))
+        except Exception:
+            self.handleError(record)
+
+# exporter处理日志只显示在界面中，不写入应用日志
+exporter_logger = logging.getLogger("exporter")
+exporter_logger.setLevel(logging.INFO)
+exporter_logger.propagate = False
+exporter_logger.addHandler(QueueLogHandler(LOG_QUEUE))
+
+class ThreadStdout:
+    """按线程分发的标准输出
+    
+    exporter模块使用print输出处理信息。登记过的线程（处理线程）的输出按行写入
+    exporter日志，其他线程的输出仍写入原标准输出，不再在每次处理时整体替换sys.stdout。
+    """
+    def __init__(self, original):
+        self.original = original
+        self._local = threading.local()
+    
+    def __getattr__(self, name):
+        # encoding、isatty等属性沿用原标准输出
+        return getattr(self.original, name)
+    
+    def capture(self):
+        """开始捕获当前线程的输出"""
+        self._local.buf = []
+    
+    def release(self):
+        """停止捕获当前线程的输出，并写出剩余内容"""
+        self.flush()
+        self._local.buf = None
+    
+    def write(self, text):
+        buf = getattr(self._local, 'buf', None)
+        if buf is None:
+            # 打包为窗口程序时原标准输出可能为None
+            return self.original.write(text) if self.original is not None else len(text)
+        buf.append(text)
+        if '\n' in text:
+            data = ''.join(buf)
+            buf.clear()
+            # 最后一段不完整的行保留在缓冲区中
+            *lines, rest = data.split('\n')
+            if rest:
+                buf.append(rest)
+            self._log_lines(lines)
+        return len(text)
+    
+    def flush(self):
+        buf = getattr(self._local, 'buf', None)
+        if buf is None:
+            if self.original is not None:
+                self.original.flush()
+        elif buf:
+            data = ''.join(buf)
+            buf.clear()
+            self._log_lines(data.split('\n'))
+    
+    @staticmethod
+    def _log_lines(lines):
+        """将非空白行写入exporter日志"""
+        for line in lines:
+            if line.strip():
+                exporter_logger.info(line.rstrip())
+
+def _thread_stdout():
+    """返回按线程分发的标准输出，首次调用时安装到sys.stdout"""
+    if not isinstance(sys.stdout, ThreadStdout):
+        sys.stdout = ThreadStdout(sys.stdout)
+    return sys.stdout
+
+# 上次生成的时间戳(秒, 字符串)，同一秒内的日志复用
+_ts_cache = (-1, "")
+
+def _ts(_time=time.time, _localtime=time.localtime):
+    """返回当前时间的日志时间戳前缀"[时:分:秒]"，同一秒内只格式化一次
+    
+    time.time和time.localtime作为默认参数预先绑定，省去每次调用的全局名和属性查找。
+    """
+    global _ts_cache
+    sec = int(_time())
+    if sec != _ts_cache[0]:
+        lt = _localtime(sec)
+        _ts_cache = (sec, f"[{lt.tm_hour:02d}:{lt.tm_min:02d}:{lt.tm_sec:02d}]")
+    return _ts_cache[1]
+
 def get_app_dir():
     """获取应用程序数据目录"""
     # 使用QStandardPaths获取跨平台的应用程序数据目录
@@ -71,9 +235,64 @@ def get_app_dir():
 # 获取应用程序目录
 APP_DIR = get_app_dir()
 
+# 处理状态文件与应用日志文件路径
+STATE_FILE = os.path.join(APP_DIR, "processing_state.json")
+LOG_FILE = os.path.join(APP_DIR, "app.log")
+
+# 用户主目录，作为文件对话框的默认位置
+_HOME = os.path.expanduser("~")
+
+# 目录存在性检查结果缓存：路径 -> (是否存在, 检查时间)
+PATH_EXISTS_TTL = 5.0  # 缓存有效期（秒）
+_path_exists_cache = {}
+
+def _cached_path_exists(path):
+    """返回缓存期内的目录存在性检查结果，没有有效缓存时返回None"""
+    entry = _path_exists_cache.get(path)
+    if entry is not None and time.monotonic() - entry[1] < PATH_EXISTS_TTL:
+        return entry[0]
+    return None
+
 # 应用程序图标路径
 ICON_PATH = os.path.join(os.path.dirname(os.path.abspath(sys.argv[0])), "icon.png")
 
+@lru_cache(maxsize=None)
+def _icon_exists():
+    """图标文件是否存在（首次使用时检查一次）"""
+    return os.path.exists(ICON_PATH)
+
+@lru_cache(maxsize=8)
+def _scaled_app_icon(size):
+    """返回缩放后的应用图标，图标不存在时返回None"""
+    if not _icon_exists():
+        return None
+    return QPixmap(ICON_PATH).scaled(size, size, Qt.KeepAspectRatio, Qt.SmoothTransformation)
+
+@lru_cache(maxsize=None)
+def get_app_qicon():
+    """返回应用图标，图标不存在时返回None"""
+    return QIcon(ICON_PATH) if _icon_exists() else None
+
+def fluent_qicon(fif):
+    """返回Fluent图标对应当前主题的QIcon，按(图标, 主题)缓存"""
+    return _fluent_qicon(fif, isDarkTheme())
+
+@lru_cache(maxsize=None)
+def _fluent_qicon(fif, dark):
+    return fif.icon(Theme.DARK if dark else Theme.LIGHT)
+
+@lru_cache(maxsize=16)
+def _mono_font(size):
+    """返回指定字号的日志等宽字体（setFont会复制字体，缓存的对象可共用）"""
+    return QFont("Consolas", size)
+
+def scaled_icon(size):
+    """返回指定尺寸的标题图标：应用图标不存在时使用视频图标"""
+    pixmap = _scaled_app_icon(size)
+    if pixmap is None:
+        pixmap = fluent_qicon(FIF.VIDEO).pixmap(size, size)
+    return pixmap
+
 # 自定义图标类
 class AppIcon(FluentIconBase):
     """ 自定义应用图标 """
@@ -87,39 +306,77 @@ class AppIcon(FluentIconBase):
             return ICON_PATH
         return ""
 
-# 处理线程类
-class ProcessingThread(QThread):
-    """处理视频的后台线程"""
-    update_signal = pyqtSignal(str)  # 进度更新信号
-    progress_signal = pyqtSignal(int, int)  # 进度条更新信号(当前值, 最大值)
+# 处理状态
+class ProcState(IntEnum):
+    """处理任务状态，由处理任务通过state_signal发送"""
+    IDLE = 0  # 未开始或已结束
+    SCANNING = 1  # 正在扫描视频文件
+    PROCESSING = 2  # 正在处理视频
+    STOPPING = 3  # 正在停止
+
+# 处理任务类
+class ProcessingSignals(QObject):
+    """处理任务的信号（QRunnable不是QObject，信号由此对象发送）"""
+    progress_ready = pyqtSignal()  # 有新进度可读取的通知信号，进度值通过take_progress获取
     complete_signal = pyqtSignal(bool, str)  # 完成信号(是否成功, 消息)
-    scanning_signal = pyqtSignal(bool)  # 扫描状态信号(True表示正在扫描，False表示处理中)
+    state_signal = pyqtSignal(int)  # 状态信号(ProcState)
+    finished = pyqtSignal()  # 任务结束信号（run返回后发送）
     
+    def __init__(self):
+        super().__init__()
+        # 运行标志，创建时置位，由界面线程清除以取消处理
+        self.running_event = threading.Event()
+        self.running_event.set()
+
+class ProcessingJob(QRunnable):
+    """在全局线程池中处理视频的任务"""
     def __init__(self, input_dir, output_dir, lead_time, tail_time, threshold, min_kills):
         super().__init__()
+        # 任务对象由界面持有，运行结束后仍需读取状态
+        self.setAutoDelete(False)
+        self.signals = ProcessingSignals()
+        self._done = threading.Event()
         self.input_dir = input_dir
         self.output_dir = output_dir
         self.lead_time = lead_time
         self.tail_time = tail_time
         self.threshold = threshold
         self.min_kills = min_kills
-        self.is_running = True
-        self.is_scanning = False
-        
+        self.state = ProcState.IDLE
+        # 进度信号节流状态
+        self._last_emit_t = 0.0
+        self._last_pct = -1
+        self._throttled_progress = None
+        # 最新进度(当前值, 最大值)，由界面线程取走；连续的更新会合并为一次
+        self._progress_lock = threading.Lock()
+        self._latest_progress = None
+        
+    def is_active(self):
+        """任务是否尚未结束（包括等待线程池调度）"""
+        return not self._done.is_set()
+    
+    def is_done(self):
+        """任务是否已结束"""
+        return self._done.is_set()
+    
     def run(self):
-        """运行处理线程"""
+        """运行处理任务"""
+        # 以较低优先级运行，耗时的编码工作由ffmpeg子进程完成，界面线程优先响应；
+        # 线程池会复用线程，结束后恢复原优先级
+        worker = QThread.currentThread()
+        priority = worker.priority()
+        worker.setPriority(QThread.LowPriority)
+        # 捕获本线程的print输出，写入exporter日志
+        stdout = _thread_stdout()
+        stdout.capture()
+        self._set_state(ProcState.PROCESSING)
+        success, message = False, "处理失败"
         try:
-            # 重定向标准输出到自定义函数
-            self._redirect_stdout()
-            
             # 确保输出目录存在
             os.makedirs(self.output_dir, exist_ok=True)
             
             # 通知UI开始处理
-            self.update_signal.emit("开始处理视频...")
-            
-            # 获取应用程序状态文件路径
-            state_file = os.path.join(APP_DIR, "processing_state.json")
+            exporter_logger.info("开始处理视频...")
             
             # 执行视频处理
             process_videos(
@@ -130,64 +387,115 @@ class ProcessingThread(QThread):
                 threshold=self.threshold,
                 min_kills=self.min_kills,
                 progress_callback=self._progress_callback,
-                state_file=state_file,
+                state_file=STATE_FILE,
                 temp_dir=None,  # 使用默认的输出目录/temp
-                is_running=lambda: self.is_running  # 传递检查函数
+                is_running=self.signals.running_event.is_set  # 直接传递Event的检查方法
             )
             
-            # 通知UI处理完成
-            self.complete_signal.emit(True, f"处理完成！输出目录: {self.output_dir}")
+            # 补发被节流的最后一次进度
+            if self._throttled_progress:
+                self._post_progress(*self._throttled_progress)
+            
+            success, message = True, f"处理完成！输出目录: {self.output_dir}"
             
         except Exception as e:
             logger.error(f"处理过程中发生错误: {str(e)}")
-            self.update_signal.emit(f"错误: {str(e)}")
-            self.complete_signal.emit(False, f"处理失败: {str(e)}")
+            exporter_logger.info(f"错误: {str(e)}")
+            message = f"处理失败: {str(e)}"
         finally:
-            # 恢复标准输出
-            self._restore_stdout()
-    
-    def _progress_callback(self, current, total, message=""):
-        """处理进度回调"""
-        # 检测是否正在扫描阶段
-        if message and ("扫描" in message or "寻找" in message):
-            if not self.is_scanning:
-                self.is_scanning = True
-                self.scanning_signal.emit(True)
-        elif current > 0 and total > 0:
-            # 当开始处理视频并且有具体进度时，表示不再是扫描阶段
-            if self.is_scanning:
-                self.is_scanning = False
-                self.scanning_signal.emit(False)
-        
-        # 发送进度信号
-        self.progress_signal.emit(current, total)
+            # 先写出未换行的剩余输出再通知UI，界面收到完成信号后最后一次读取日志时不会遗漏
+            stdout.release()
+            worker.setPriority(priority)
+            self.signals.complete_signal.emit(success, message)
+            # 先标记结束再发送信号，界面线程连接信号后检查is_done即不会遗漏
+            self._done.set()
+            self.signals.finished.emit()
+    
+    def _progress_callback(self, current, total, message="", phase=None):
+        """处理进度回调，phase为process_videos报告的处理阶段"""
+        # 根据处理阶段切换状态（停止过程中不再切换状态）
+        if phase is not None and self.state != ProcState.STOPPING:
+            self._set_state(ProcState.SCANNING if phase == "scan" else ProcState.PROCESSING)
+        
+        # 发送进度信号：仅在百分比变化或距上次发送超过PROGRESS_EMIT_INTERVAL时发送
+        pct = (current * 100) // total if total > 0 else -1
+        now = time.monotonic()
+        if pct != self._last_pct or now - self._last_emit_t > PROGRESS_EMIT_INTERVAL:
+            self._last_pct = pct
+            self._last_emit_t = now
+            self._throttled_progress = None
+            self._post_progress(current, total)
+        else:
+            self._throttled_progress = (current, total)
         
         # 如果有消息则发送更新信号
         if message:
-            self.update_signal.emit(message)
+            exporter_logger.info(message)
     
-    def _redirect_stdout(self):
-        """重定向标准输出"""
-        self.old_stdout = sys.stdout
-        sys.stdout = self
-        
-    def _restore_stdout(self):
-        """恢复标准输出"""
-        sys.stdout = self.old_stdout
+    def _set_state(self, state):
+        """切换任务状态，仅在状态变化时发送信号"""
+        if self.state != state:
+            self.state = state
+            self.signals.state_signal.emit(int(state))
     
-    def write(self, text):
-        """接收标准输出内容并发送信号"""
-        if text.strip():  # 跳过空白行
-            self.update_signal.emit(text.rstrip())
+    def _post_progress(self, current, total):
+        """记录最新进度，仅在界面线程尚未取走上一次进度时发送通知"""
+        with self._progress_lock:
+            notify = self._latest_progress is None
+            self._latest_progress = (current, total)
+        if notify:
+            self.signals.progress_ready.emit()
     
-    def flush(self):
-        """实现flush方法以兼容标准输出"""
-        pass
+    def take_progress(self):
+        """取走最新进度，没有新进度时返回None"""
+        with self._progress_lock:
+            progress = self._latest_progress
+            self._latest_progress = None
+        return progress
     
     def stop(self):
         """停止处理"""
-        self.is_running = False
-        self.update_signal.emit("正在停止处理，请稍候...")
+        self.signals.running_event.clear()
+        self._set_state(ProcState.STOPPING)
+        exporter_logger.info("正在停止处理，请稍候...")
+
+def _open_in_file_manager(path):
+    """使用系统文件管理器打开目录"""
+    if sys.platform == "win32":
+        os.startfile(path)
+    elif sys.platform == "darwin":
+        subprocess.Popen(["open", path])
+    else:
+        subprocess.Popen(["xdg-open", path])
+
+def _remove_state_file():
+    """删除处理状态文件，返回是否确实删除了文件"""
+    try:
+        Path(STATE_FILE).unlink()
+        return True
+    except FileNotFoundError:
+        return False
+
+# 文件操作任务
+class FileTaskSignals(QObject):
+    """文件操作任务的完成信号"""
+    finished = pyqtSignal(object, str)  # 完成信号(返回值, 错误信息，成功时为空)
+
+class FileTask(QRunnable):
+    """在线程池中执行的文件操作，避免慢速存储阻塞界面线程"""
+    def __init__(self, func, *args):
+        super().__init__()
+        self.func = func
+        self.args = args
+        self.signals = FileTaskSignals()
+    
+    def run(self):
+        """执行文件操作并发送结果"""
+        try:
+            result, error = self.func(*self.args), ""
+        except Exception as e:
+            result, error = None, str(e)
+        self.signals.finished.emit(result, error)
 
 # 主页界面
 class MainInterface(ScrollArea):
@@ -197,7 +505,15 @@ class MainInterface(ScrollArea):
         self.parent_window = parent
         self.settings = QSettings(ORG_NAME, APP_NAME)
         self.init_ui()
-        self.processing_thread = None
+        self.processing_job = None
+        self.proc_state = ProcState.IDLE  # 界面显示的处理状态，仅由state_signal更新
+        self._last_prog = None  # 上次显示的进度(最大值, 当前值, 文字)
+        self._confirm_boxes = {}  # 按标题复用的确认对话框
+        self._stop_pending = False
+        # 处理期间定时读取处理日志队列
+        self._log_drain_timer = QTimer(self)
+        self._log_drain_timer.setInterval(LOG_DRAIN_INTERVAL)
+        self._log_drain_timer.timeout.connect(self._drain_log_queue)
         self.load_settings()
         
     def init_ui(self):
@@ -215,11 +531,8 @@ class MainInterface(ScrollArea):
         # 应用图标和标题
         header_layout = QHBoxLayout()
         icon_label = QLabel()
-        if os.path.exists(ICON_PATH):
-            pixmap = QPixmap(ICON_PATH).scaled(64, 64, Qt.KeepAspectRatio, Qt.SmoothTransformation)
-            icon_label.setPixmap(pixmap)
-        else:
-            icon_label.setPixmap(FIF.VIDEO.icon().pixmap(64, 64))
+        # 图标在窗口显示后再加载，标签尺寸固定，加载后布局不变
+        QTimer.singleShot(0, lambda: icon_label.setPixmap(scaled_icon(64)))
         icon_label.setFixedSize(64, 64)
         header_layout.addWidget(icon_label)
         
@@ -456,97 +769,161 @@ class MainInterface(ScrollArea):
         
         self.main_layout.addWidget(progress_card)
     
+    # 主页设置项：键 -> (默认值, 类型)
+    SETTING_DEFAULTS = {
+        "input_dir": ("", str),
+        "output_dir": ("", str),
+        "lead_time": (10, int),
+        "tail_time": (5, int),
+        "threshold": (30, int),
+        "min_kills": (2, int),
+        "log_font_size": (9, int),
+    }
+    
     def load_settings(self):
         """从配置文件加载设置"""
-        self.input_dir_edit.setText(self.settings.value("input_dir", ""))
-        self.output_dir_edit.setText(self.settings.value("output_dir", ""))
-        self.lead_time_spinbox.setValue(int(self.settings.value("lead_time", 10)))
-        self.tail_time_spinbox.setValue(int(self.settings.value("tail_time", 5)))
-        self.threshold_spinbox.setValue(int(self.settings.value("threshold", 30)))
-        self.min_kills_spinbox.setValue(int(self.settings.value("min_kills", 2)))
+        # 一次读取全部设置项，再分别应用到控件
+        values = {
+            key: self.settings.value(key, default, type=value_type)
+            for key, (default, value_type) in self.SETTING_DEFAULTS.items()
+        }
+        self.input_dir_edit.setText(values["input_dir"])
+        self.output_dir_edit.setText(values["output_dir"])
+        self.lead_time_spinbox.setValue(values["lead_time"])
+        self.tail_time_spinbox.setValue(values["tail_time"])
+        self.threshold_spinbox.setValue(values["threshold"])
+        self.min_kills_spinbox.setValue(values["min_kills"])
+        # 记录已保存的值，保存时只写入变化的设置项
+        self._saved_settings = self._current_settings()
         
         # 应用日志字体大小设置
-        log_font_size = int(self.settings.value("log_font_size", 9))
-        self.progress_text.setFont(QFont("Consolas", log_font_size))
+        self.progress_text.setFont(_mono_font(values["log_font_size"]))
+    
+    def _current_settings(self):
+        """返回控件中的当前设置"""
+        return {
+            "input_dir": self.input_dir_edit.text(),
+            "output_dir": self.output_dir_edit.text(),
+            "lead_time": self.lead_time_spinbox.value(),
+            "tail_time": self.tail_time_spinbox.value(),
+            "threshold": self.threshold_spinbox.value(),
+            "min_kills": self.min_kills_spinbox.value(),
+        }
     
     def save_settings(self):
-        """保存当前设置到配置文件"""
-        self.settings.setValue("input_dir", self.input_dir_edit.text())
-        self.settings.setValue("output_dir", self.output_dir_edit.text())
-        self.settings.setValue("lead_time", self.lead_time_spinbox.value())
-        self.settings.setValue("tail_time", self.tail_time_spinbox.value())
-        self.settings.setValue("threshold", self.threshold_spinbox.value())
-        self.settings.setValue("min_kills", self.min_kills_spinbox.value())
-        self.settings.sync()
+        """保存当前设置到配置文件（由Qt在空闲或退出时写入磁盘），只写入变化的设置项"""
+        current = self._current_settings()
+        for key, value in current.items():
+            if self._saved_settings.get(key) != value:
+                self.settings.setValue(key, value)
+        self._saved_settings = current
     
     def _browse_input_dir(self):
         """浏览并选择输入目录"""
-        current_dir = self.input_dir_edit.text() or os.path.expanduser("~")
+        current_dir = self.input_dir_edit.text() or _HOME
         dir_path = QFileDialog.getExistingDirectory(
-            self, "选择War Thunder录像目录", current_dir)
+            self, "选择War Thunder录像目录", current_dir,
+            QFileDialog.ShowDirsOnly | QFileDialog.DontResolveSymlinks | QFileDialog.ReadOnly)
         if dir_path:
             self.input_dir_edit.setText(dir_path)
     
     def _browse_output_dir(self):
         """浏览并选择输出目录"""
-        current_dir = self.output_dir_edit.text() or os.path.expanduser("~")
+        current_dir = self.output_dir_edit.text() or _HOME
         dir_path = QFileDialog.getExistingDirectory(
-            self, "选择输出目录", current_dir)
+            self, "选择输出目录", current_dir,
+            QFileDialog.ShowDirsOnly | QFileDialog.DontResolveSymlinks)
         if dir_path:
             self.output_dir_edit.setText(dir_path)
     
+    def _confirm(self, title, content):
+        """显示确认对话框并返回用户选择；同一标题的对话框创建一次后复用，只更新正文"""
+        box = self._confirm_boxes.get(title)
+        if box is None or sip.isdeleted(box):
+            box = MessageBox(title, content, self.parent_window)
+            self._confirm_boxes[title] = box
+        else:
+            box.contentLabel.setText(content)
+        return box.exec()
+    
+    def _run_file_task(self, callback, func, *args):
+        """在全局线程池中执行文件操作，完成后在界面线程调用callback(结果, 错误信息)"""
+        task = FileTask(func, *args)
+        task.signals.finished.connect(callback, Qt.QueuedConnection)
+        QThreadPool.globalInstance().start(task)
+    
     def _open_output_dir(self):
         """打开输出目录"""
         output_dir = self.output_dir_edit.text()
-        if output_dir and os.path.exists(output_dir):
-            # 使用系统默认程序打开文件夹
-            QDesktopServices.openUrl(QUrl.fromLocalFile(output_dir))
-        else:
+        if not output_dir:
             MessageBox("警告", "输出目录不存在", self.parent_window).exec()
+            return
+        
+        def on_checked(exists, error):
+            if exists:
+                # 使用系统默认程序打开文件夹
+                try:
+                    _open_in_file_manager(output_dir)
+                except OSError as e:
+                    self._update_log(f"❌ 无法打开输出目录: {e}")
+            else:
+                MessageBox("警告", "输出目录不存在", self.parent_window).exec()
+        
+        self._run_file_task(on_checked, os.path.exists, output_dir)
     
     def _reset_timestamp(self):
         """重置处理时间戳，允许重新处理所有视频"""
-        state_file = os.path.join(APP_DIR, "processing_state.json")
-        
-        if os.path.exists(state_file):
-            dialog = MessageBox(
+        # 状态文件的检查与删除都在线程池中执行
+        self._run_file_task(self._on_state_file_checked, os.path.exists, STATE_FILE)
+    
+    def _on_state_file_checked(self, exists, error):
+        """状态文件检查完成后，确认并删除状态文件"""
+        if exists:
+            if self._confirm(
                 "确认重置", 
-                "确定要重置处理时间戳吗？这将允许程序重新处理所有视频文件，包括已经处理过的。",
-                self.parent_window
+                "确定要重置处理时间戳吗？这将允许程序重新处理所有视频文件，包括已经处理过的。"
+            ):
+                self._run_file_task(self._on_state_file_removed, _remove_state_file)
+        else:
+            self._on_state_file_missing()
+    
+    def _on_state_file_missing(self):
+        """状态文件不存在时的提示"""
+        self._update_log("ℹ️ 未找到处理状态文件，无需重置")
+        InfoBar.info(
+            title="提示",
+            content="未找到处理状态文件，当前已经处于初始状态，下次运行将处理所有视频文件。",
+            parent=self.parent_window,
+            position=InfoBarPosition.TOP,
+            duration=3000
+        )
+    
+    def _on_state_file_removed(self, removed, error):
+        """状态文件删除完成后更新日志和提示"""
+        if not error and not removed:
+            # 确认期间状态文件已被删除
+            self._on_state_file_missing()
+        elif not error:
+            self._update_log("✅ 处理时间戳已重置，下次运行将处理所有视频文件")
+            InfoBar.success(
+                title="重置成功",
+                content="处理时间戳已成功重置，下次运行将处理所有视频文件。",
+                parent=self.parent_window,
+                position=InfoBarPosition.TOP,
+                duration=3000
             )
-            
-            if dialog.exec():
-                try:
-                    os.remove(state_file)
-                    self._update_log("✅ 处理时间戳已重置，下次运行将处理所有视频文件")
-                    InfoBar.success(
-                        title="重置成功",
-                        content="处理时间戳已成功重置，下次运行将处理所有视频文件。",
-                        parent=self.parent_window,
-                        position=InfoBarPosition.TOP,
-                        duration=3000
-                    )
-                except Exception as e:
-                    self._update_log(f"❌ 重置时间戳失败: {str(e)}")
-                    InfoBar.error(
-                        title="重置失败",
-                        content=f"无法重置处理时间戳: {str(e)}",
-                        parent=self.parent_window,
-                        position=InfoBarPosition.TOP,
-                        duration=3000
-                    )
         else:
-            self._update_log("ℹ️ 未找到处理状态文件，无需重置")
-            InfoBar.info(
-                title="提示",
-                content="未找到处理状态文件，当前已经处于初始状态，下次运行将处理所有视频文件。",
+            self._update_log(f"❌ 重置时间戳失败: {error}")
+            InfoBar.error(
+                title="重置失败",
+                content=f"无法重置处理时间戳: {error}",
                 parent=self.parent_window,
                 position=InfoBarPosition.TOP,
                 duration=3000
             )
     
     def _validate_inputs(self):
-        """验证输入参数有效性"""
+        """验证输入参数有效性（不访问文件系统）"""
         input_dir = self.input_dir_edit.text()
         output_dir = self.output_dir_edit.text()
         
@@ -559,15 +936,6 @@ class MainInterface(ScrollArea):
             )
             return False
         
-        if not os.path.exists(input_dir):
-            InfoBar.warning(
-                title="警告",
-                content="输入目录不存在",
-                parent=self.parent_window,
-                position=InfoBarPosition.TOP
-            )
-            return False
-        
         if not output_dir:
             InfoBar.warning(
                 title="警告",
@@ -577,26 +945,21 @@ class MainInterface(ScrollArea):
             )
             return False
         
+        return True
+    
+    def _confirm_segment_length(self):
+        """检查保留时长参数，超过典型视频长度时请用户确认"""
         # 检查击杀前保留和击杀后保留总时长是否超过典型视频长度
         lead_time = self.lead_time_spinbox.value()
         tail_time = self.tail_time_spinbox.value()
         
-        # 从导入的常量获取典型视频长度
-        from exporter.utils.constants import TYPICAL_VIDEO_LENGTH
-        
         total_segment_time = lead_time + tail_time
         
         # 如果总时间超过典型视频长度，显示警告
         if total_segment_time > TYPICAL_VIDEO_LENGTH:
             warning_msg = f"击杀前({lead_time}秒)和击杀后({tail_time}秒)保留时间总计{total_segment_time}秒，超过典型视频长度({TYPICAL_VIDEO_LENGTH}秒)，可能导致部分片段无法导出"
             
-            dialog = MessageBox(
-                "参数警告", 
-                f"{warning_msg}\n\n是否仍要继续处理？",
-                self.parent_window
-            )
-            
-            if not dialog.exec():
+            if not self._confirm("参数警告", f"{warning_msg}\n\n是否仍要继续处理？"):
                 return False
         
         return True
@@ -606,6 +969,43 @@ class MainInterface(ScrollArea):
         if not self._validate_inputs():
             return
         
+        input_dir = self.input_dir_edit.text()
+        exists = _cached_path_exists(input_dir)
+        if exists is not None:
+            self._on_input_dir_checked(input_dir, exists)
+            return
+        
+        # 网络驱动器或休眠的移动硬盘上检查目录可能阻塞，放到线程池中执行
+        self.start_button.setEnabled(False)
+        self._run_file_task(
+            lambda exists, error: self._on_input_dir_checked(input_dir, bool(exists), cache=True),
+            os.path.exists, input_dir
+        )
+    
+    def _on_input_dir_checked(self, input_dir, exists, cache=False):
+        """输入目录检查完成后继续开始处理"""
+        if cache:
+            _path_exists_cache[input_dir] = (exists, time.monotonic())
+            self.start_button.setEnabled(True)
+        
+        if not exists:
+            InfoBar.warning(
+                title="警告",
+                content="输入目录不存在",
+                parent=self.parent_window,
+                position=InfoBarPosition.TOP
+            )
+            return
+        
+        if not self._confirm_segment_length():
+            return
+        
+        self._launch_processing()
+    
+    def _launch_processing(self):
+        """创建并启动处理任务"""
+        _ensure_exporter()
+        
         # 保存当前设置
         self.save_settings()
         
@@ -622,25 +1022,29 @@ class MainInterface(ScrollArea):
         self.stop_button.setEnabled(True)
         self.progress_bar.setValue(0)
         self.progress_text.setText("正在准备...")
-        self.is_scanning = False  # 初始化扫描状态为False
-        
-        # 更新日志
-        self._update_log("开始处理视频...")
-        self._update_log(f"输入目录: {input_dir}")
-        self._update_log(f"输出目录: {output_dir}")
-        self._update_log(f"参数: 前置={lead_time}秒, 后置={tail_time}秒, 阈值={threshold}秒, 最少击杀={min_kills}次")
-        self._update_log(f"数据目录: {APP_DIR}")
-        self._update_log("命令行窗口已隐藏，所有操作信息将显示在日志中")
-        
-        # 创建并启动处理线程
-        self.processing_thread = ProcessingThread(
+        self.proc_state = ProcState.IDLE
+        self._last_prog = None
+        
+        # 更新日志（合并为一条多行消息，共用一个时间戳）
+        self._update_log("\n".join([
+            "开始处理视频...",
+            f"输入目录: {input_dir}",
+            f"输出目录: {output_dir}",
+            f"参数: 前置={lead_time}秒, 后置={tail_time}秒, 阈值={threshold}秒, 最少击杀={min_kills}次",
+            f"数据目录: {APP_DIR}",
+            "命令行窗口已隐藏，所有操作信息将显示在日志中",
+        ]))
+        
+        # 创建处理任务并提交到全局线程池
+        self.processing_job = ProcessingJob(
             input_dir, output_dir, lead_time, tail_time, threshold, min_kills
         )
-        self.processing_thread.update_signal.connect(self._update_log)
-        self.processing_thread.progress_signal.connect(self._update_progress)
-        self.processing_thread.complete_signal.connect(self._process_complete)
-        self.processing_thread.scanning_signal.connect(self._update_scanning_state)
-        self.processing_thread.start()
+        signals = self.processing_job.signals
+        signals.progress_ready.connect(self._consume_progress, Qt.QueuedConnection)
+        signals.complete_signal.connect(self._process_complete, Qt.QueuedConnection)
+        signals.state_signal.connect(self._on_state_changed, Qt.QueuedConnection)
+        QThreadPool.globalInstance().start(self.processing_job)
+        self._log_drain_timer.start()
         
         # 显示通知
         InfoBar.success(
@@ -653,69 +1057,105 @@ class MainInterface(ScrollArea):
     
     def _stop_processing(self):
         """停止处理"""
-        if self.processing_thread and self.processing_thread.isRunning():
-            dialog = MessageBox(
+        if self.processing_job and self.processing_job.is_active():
+            if self._confirm(
                 "确认停止", 
-                "确定要停止当前处理任务吗？未完成的导出可能会丢失。",
-                self.parent_window
-            )
-            
-            if dialog.exec():
+                "确定要停止当前处理任务吗？未完成的导出可能会丢失。"
+            ):
                 self._update_log("用户已取消处理")
                 self.progress_text.setText("正在停止...")
                 # 禁用停止按钮，防止多次点击
                 self.stop_button.setEnabled(False)
                 
-                # 停止处理线程
-                self.processing_thread.stop()
-                
-                # 使用定时器检查线程状态，避免UI卡死
-                def check_thread_status():
-                    if not self.processing_thread.isRunning():
-                        # 线程已停止，恢复UI状态
-                        self.is_scanning = False  # 重置扫描状态
-                        self._process_complete(False, "处理已取消")
-                        timer.stop()
+                # 停止处理任务，任务结束后通过finished信号恢复UI状态
+                self._stop_pending = True
+                self.processing_job.signals.finished.connect(self._on_processing_stopped, Qt.QueuedConnection)
+                self.processing_job.stop()
                 
-                # 创建定时器
-                timer = QTimer(self)
-                timer.timeout.connect(check_thread_status)
-                timer.start(200)  # 每200毫秒检查一次
+                # 任务可能在连接信号前就已结束
+                if self.processing_job.is_done():
+                    self._on_processing_stopped()
+    
+    @pyqtSlot()
+    def _on_processing_stopped(self):
+        """处理任务停止后恢复UI状态"""
+        if not self._stop_pending:
+            return
+        self._stop_pending = False
+        # 只响应一次：断开finished连接（PyQt5不支持Qt.SingleShotConnection）
+        try:
+            self.processing_job.signals.finished.disconnect(self._on_processing_stopped)
+        except (TypeError, AttributeError):
+            pass
+        self._process_complete(False, "处理已取消")
     
     def _update_log(self, message):
         """更新日志输出"""
         # 转发到主窗口的日志显示
-        if hasattr(self.parent_window, 'update_log'):
-            self.parent_window.update_log(message)
+        self.parent_window.update_log(message)
+    
+    def _drain_log_queue(self, limit=LOG_DRAIN_BATCH):
+        """从处理日志队列中读取日志并输出，limit为None时读取全部"""
+        count = 0
+        while limit is None or count < limit:
+            try:
+                line = LOG_QUEUE.get_nowait()
+            except queue.Empty:
+                break
+            self._update_log(line)
+            count += 1
+    
+    @pyqtSlot()
+    def _consume_progress(self):
+        """读取处理任务的最新进度并更新进度条"""
+        progress = self.processing_job.take_progress() if self.processing_job else None
+        if progress:
+            self._update_progress(*progress)
     
     def _update_progress(self, current, total):
         """更新进度条"""
-        if self.is_scanning:
+        if self.proc_state == ProcState.SCANNING:
             # 处于扫描状态，显示忙碌状态
-            self.progress_bar.setMaximum(0)
-            self.progress_bar.setValue(0)
-            self.progress_text.setText("正在扫描视频文件...")
+            target = (0, 0, "正在扫描视频文件...")
+        elif self.proc_state == ProcState.STOPPING:
+            # 停止过程中保持进度条不变
+            target = (self.progress_bar.maximum(), self.progress_bar.value(), "正在停止...")
         elif total > 0:
             # 处理视频状态，显示具体进度
-            self.progress_bar.setMaximum(total)
-            self.progress_bar.setValue(current)
-            self.progress_text.setText(f"进度: {current}/{total} ({int(current/total*100)}%)")
+            target = (total, current, f"进度: {current}/{total} ({int(current/total*100)}%)")
         else:
             # 未知状态，显示忙碌状态
-            self.progress_bar.setMaximum(0)
-            self.progress_bar.setValue(0)
-            self.progress_text.setText("正在准备...")
+            target = (0, 0, "正在准备...")
+        
+        # 与上次显示的进度相同时跳过所有控件操作
+        if target == self._last_prog:
+            return
+        self._last_prog = target
+        maximum, value, text = target
+        self._set_progress(maximum, value)
+        self.progress_text.setText(text)
+    
+    def _set_progress(self, maximum, value):
+        """设置进度条，仅在数值变化时调用setter，避免重复重绘"""
+        if self.progress_bar.maximum() != maximum:
+            self.progress_bar.setMaximum(maximum)
+        if self.progress_bar.value() != value:
+            self.progress_bar.setValue(value)
     
+    @pyqtSlot(bool, str)
     def _process_complete(self, success, message):
         """处理完成回调"""
+        # 先输出处理线程剩余的日志
+        self._log_drain_timer.stop()
+        self._drain_log_queue(limit=None)
+        
         # 恢复UI状态
         self.start_button.setEnabled(True)
         self.stop_button.setEnabled(False)
-        self.is_scanning = False  # 重置扫描状态
+        self.proc_state = ProcState.IDLE
         
         if success:
-            self.progress_bar.setMaximum(100)  # 确保进度条有最大值
-            self.progress_bar.setValue(100)    # 设置为100%
+            self._set_progress(100, 100)  # 设置为100%
             self.progress_text.setText("处理完成")
             self._update_log(f"✅ {message}")
             
@@ -737,8 +1177,7 @@ class MainInterface(ScrollArea):
                 duration=3000
             )
         else:
-            self.progress_bar.setMaximum(100)
-            self.progress_bar.setValue(0)
+            self._set_progress(100, 0)
             self.progress_text.setText("处理已中断")
             self._update_log(f"❌ {message}")
             
@@ -751,9 +1190,13 @@ class MainInterface(ScrollArea):
                 duration=5000
             )
     
-    def _update_scanning_state(self, is_scanning):
-        """更新扫描状态"""
-        self.is_scanning = is_scanning
+    @pyqtSlot(int)
+    def _on_state_changed(self, state):
+        """处理任务状态变化"""
+        # 任务结束后到达的状态信号不再处理
+        if self.proc_state == ProcState.IDLE and not self.stop_button.isEnabled():
+            return
+        self.proc_state = ProcState(state)
         self._update_progress(0, 0)
 
     def _organize_by_date(self):
@@ -776,19 +1219,14 @@ class MainInterface(ScrollArea):
                 position=InfoBarPosition.TOP
             )
             return
-        from exporter.utils.file_utils import parse_video_time
+        from exporter.utils.file_utils import iter_new_videos
         import shutil
         moved = 0
-        for fname in os.listdir(input_dir):
-            if not fname.lower().endswith('.mp4'):
-                continue
-            dt = parse_video_time(fname)
-            if not dt:
-                continue
+        # 先取完整列表再移动，避免边遍历目录边修改；整理时扩展名不区分大小写
+        for src, fname, dt in list(iter_new_videos(input_dir, ignore_case=True)):
             date_str = dt.strftime('%Y-%m-%d')
             target_dir = os.path.join(output_dir, date_str)
             os.makedirs(target_dir, exist_ok=True)
-            src = os.path.join(input_dir, fname)
             dst = os.path.join(target_dir, fname)
             try:
                 shutil.move(src, dst)
@@ -825,7 +1263,7 @@ class MainInterface(ScrollArea):
                 position=InfoBarPosition.TOP
             )
             return
-        file_dialog = QFileDialog(self, "选择要提取音频的视频文件", os.path.expanduser("~"))
+        file_dialog = QFileDialog(self, "选择要提取音频的视频文件", _HOME)
         file_dialog.setFileMode(QFileDialog.ExistingFile)
         file_dialog.setNameFilter("视频文件 (*.mp4 *.avi *.mov *.mkv)")
         if file_dialog.exec_():
@@ -865,7 +1303,7 @@ class SettingsInterface(QDialog):
         
         # 设置窗口属性
         self.setWindowTitle("设置")
-        self.setWindowIcon(QIcon(ICON_PATH) if os.path.exists(ICON_PATH) else FIF.SETTING.icon())
+        self.setWindowIcon(get_app_qicon() or fluent_qicon(FIF.SETTING))
         self.setMinimumWidth(500)
         self.setMinimumHeight(300)
         
@@ -910,7 +1348,7 @@ class SettingsInterface(QDialog):
         theme_label.setFixedWidth(120)
         self.theme_combo = ComboBox(self)
         self.theme_combo.addItems(["浅色", "深色", "跟随系统"])
-        self.theme_combo.setCurrentIndex(int(self.parent_window.settings.value("theme", 2)))
+        self.theme_combo.setCurrentIndex(self.parent_window.settings.value("theme", 2, type=int))
         theme_layout.addWidget(theme_label)
         theme_layout.addWidget(self.theme_combo)
         appearance_layout.addLayout(theme_layout)
@@ -921,11 +1359,23 @@ class SettingsInterface(QDialog):
         log_font_label.setFixedWidth(120)
         self.log_font_spinbox = SpinBox()
         self.log_font_spinbox.setRange(8, 16)
-        self.log_font_spinbox.setValue(int(self.parent_window.settings.value("log_font_size", 9)))
+        self.log_font_spinbox.setValue(self.parent_window.settings.value("log_font_size", 9, type=int))
         log_font_layout.addWidget(log_font_label)
         log_font_layout.addWidget(self.log_font_spinbox)
         appearance_layout.addLayout(log_font_layout)
         
+        # 日志最大行数
+        log_blocks_layout = QHBoxLayout()
+        log_blocks_label = StrongBodyLabel("日志最大行数:")
+        log_blocks_label.setFixedWidth(120)
+        self.log_blocks_spinbox = SpinBox()
+        self.log_blocks_spinbox.setRange(500, 50000)
+        self.log_blocks_spinbox.setSingleStep(500)
+        self.log_blocks_spinbox.setValue(self.parent_window.settings.value("log_max_blocks", LOG_MAX_BLOCKS, type=int))
+        log_blocks_layout.addWidget(log_blocks_label)
+        log_blocks_layout.addWidget(self.log_blocks_spinbox)
+        appearance_layout.addLayout(log_blocks_layout)
+        
         settings_layout.addWidget(appearance_card)
         
         # 关于卡片
@@ -961,7 +1411,7 @@ class SettingsInterface(QDialog):
         """应用设置"""
         # 主题设置
         theme_index = self.theme_combo.currentIndex()
-        self.parent_window.settings.setValue("theme", theme_index)
+        self.parent_window.store_setting("theme", theme_index)
         
         # 使用字典映射主题
         theme_map = {
@@ -974,18 +1424,15 @@ class SettingsInterface(QDialog):
         
         # 日志字体大小
         log_font_size = self.log_font_spinbox.value()
-        self.parent_window.settings.setValue("log_font_size", log_font_size)
+        self.parent_window.store_setting("log_font_size", log_font_size)
         
-        # 更新日志字体大小 - 安全地访问属性
-        if hasattr(self.parent_window, 'log_text') and self.parent_window.log_text:
-            self.parent_window.log_text.setFont(QFont("Consolas", log_font_size))
+        # 更新日志和进度文字字体
+        self.parent_window.set_log_font_size(log_font_size)
         
-        # 更新主界面进度文字字体 - 安全地访问属性
-        if (hasattr(self.parent_window, 'main_interface') and 
-                self.parent_window.main_interface and 
-                hasattr(self.parent_window.main_interface, 'progress_text') and
-                self.parent_window.main_interface.progress_text):
-            self.parent_window.main_interface.progress_text.setFont(QFont("Consolas", log_font_size))
+        # 日志最大行数，立即应用到日志框
+        log_max_blocks = self.log_blocks_spinbox.value()
+        self.parent_window.store_setting("log_max_blocks", log_max_blocks)
+        self.parent_window.set_log_max_blocks(log_max_blocks)
         
         # 显示应用通知
         InfoBar.success(
@@ -1007,51 +1454,85 @@ class MainWindow(QWidget):
         self.resize(1200, 750)  # 调整默认窗口大小，更适合显示内容
         self.setMinimumSize(1000, 600)
         
-        # 设置应用程序图标
-        if os.path.exists(ICON_PATH):
-            self.setWindowIcon(QIcon(ICON_PATH))
+        # 应用程序图标在窗口显示后再加载
+        QTimer.singleShot(0, self._load_icon)
         
         # 初始化设置
         self.settings = QSettings(ORG_NAME, APP_NAME)
+        self._settings_dirty = False  # 是否有尚未确认写入磁盘的设置
         self._load_app_settings()
         
+        # 日志缓冲区，由定时器合并后批量写入日志框；
+        # 与日志框同样限制条数，刷新前积压的旧日志直接丢弃
+        self._log_max_blocks = self.settings.value("log_max_blocks", LOG_MAX_BLOCKS, type=int)
+        self._log_buf = deque(maxlen=self._log_max_blocks)
+        self._log_timer = QTimer(self)
+        self._log_timer.setInterval(LOG_FLUSH_INTERVAL)
+        self._log_timer.setSingleShot(True)
+        self._log_timer.timeout.connect(self._flush_log)
+        
+        # 已确认退出、正在等待处理任务结束
+        self._close_pending = False
+        
+        # 主界面在创建主布局时生成
+        self.main_interface = None
+        
+        # 应用日志监听线程，由程序入口设置，关闭窗口时停止
+        self.log_listener = None
+        
         # 创建主布局
         self._create_main_layout()
         
         # 恢复窗口状态
         self._restore_window_state()
     
+    def _load_icon(self):
+        """设置应用程序图标"""
+        app_icon = get_app_qicon()
+        if app_icon is not None:
+            self.setWindowIcon(app_icon)
+    
     def _load_app_settings(self):
         """加载应用程序设置"""
         # 主题设置
-        theme_index = int(self.settings.value("theme", 2))  # 默认跟随系统
+        theme_index = self.settings.value("theme", 2, type=int)  # 默认跟随系统
         theme_map = {
             0: Theme.LIGHT,
             1: Theme.DARK,
             2: Theme.AUTO
         }
-        setTheme(theme_map[theme_index])
+        setTheme(theme_map.get(theme_index, Theme.AUTO))
     
     def _create_main_layout(self):
         """创建主布局"""
-        # 创建主布局
+        # 创建主布局，主界面与日志之间用分割条分隔，用户可拖动调整宽度
         main_layout = QHBoxLayout(self)
         main_layout.setContentsMargins(10, 10, 10, 10)
-        main_layout.setSpacing(10)
+        self.splitter = QSplitter(Qt.Horizontal, self)
+        self.splitter.setHandleWidth(10)
+        self.splitter.setChildrenCollapsible(False)
+        main_layout.addWidget(self.splitter)
         
         # 创建主界面
         self.main_interface = MainInterface(self)
-        main_layout.addWidget(self.main_interface, 2)  # 主界面占2/3宽度
+        self.splitter.addWidget(self.main_interface)
         
-        # 创建设置页面
-        self.settings_interface = SettingsInterface(self)
+        # 设置页面在首次打开时创建
+        self.settings_interface = None
         
         # 创建日志卡片（放在右侧）
         self.log_card = self._create_log_widget()
-        main_layout.addWidget(self.log_card, 1)  # 日志占1/3宽度
+        self.splitter.addWidget(self.log_card)
+        
+        # 主界面占2/3宽度，日志占1/3宽度
+        self.splitter.setStretchFactor(0, 2)
+        self.splitter.setStretchFactor(1, 1)
     
     def _create_log_widget(self):
         """创建日志显示部件"""
+        # 日志框和日志卡片共用的尺寸策略（setSizePolicy会复制）
+        expanding = QSizePolicy(QSizePolicy.Expanding, QSizePolicy.Expanding)
+        
         # 创建日志卡片
         log_card = CardWidget(self)
         log_layout = QVBoxLayout(log_card)
@@ -1074,41 +1555,61 @@ class MainWindow(QWidget):
         log_layout.addLayout(title_layout)
         
         # 日志文本框
-        self.log_text = TextEdit()
+        self.log_text = PlainTextEdit()
         self.log_text.setReadOnly(True)
-        log_font_size = int(self.settings.value("log_font_size", 9))
-        self.log_text.setFont(QFont("Consolas", log_font_size))
+        self.log_text.setMaximumBlockCount(self._log_max_blocks)
+        log_font_size = self.settings.value("log_font_size", 9, type=int)
+        self.log_text.setFont(_mono_font(log_font_size))
         self.log_text.setMinimumWidth(300)
-        self.log_text.setSizePolicy(QSizePolicy.Expanding, QSizePolicy.Expanding)
+        self.log_text.setSizePolicy(expanding)
         log_layout.addWidget(self.log_text)
         
         # 日志卡片应该占用更多空间
-        log_card.setSizePolicy(QSizePolicy.Expanding, QSizePolicy.Expanding)
+        log_card.setSizePolicy(expanding)
         
         return log_card
     
     def _show_settings(self):
         """显示设置对话框"""
+        if self.settings_interface is None:
+            self.settings_interface = SettingsInterface(self)
         self.settings_interface.exec_()
     
     def _restore_window_state(self):
         """恢复窗口状态"""
         # 恢复窗口大小和位置
-        geometry = self.settings.value("window_geometry")
-        if geometry:
+        geometry = self.settings.value("window_geometry", QByteArray(), type=QByteArray)
+        if not geometry.isEmpty():
             self.restoreGeometry(geometry)
+        
+        # 恢复主界面与日志的宽度比例
+        splitter_state = self.settings.value("splitter_state", QByteArray(), type=QByteArray)
+        if not splitter_state.isEmpty():
+            self.splitter.restoreState(splitter_state)
     
     def _save_window_state(self):
         """保存窗口状态"""
         # 保存窗口大小和位置
-        self.settings.setValue("window_geometry", self.saveGeometry())
+        self.store_setting("window_geometry", self.saveGeometry())
+        self.store_setting("splitter_state", self.splitter.saveState())
+    
+    def store_setting(self, key, value):
+        """写入设置项并标记为待写入磁盘，关闭窗口时统一sync"""
+        self.settings.setValue(key, value)
+        self._settings_dirty = True
     
     def closeEvent(self, event):
         """窗口关闭事件"""
         # 检查是否有处理正在进行
-        if (hasattr(self, 'main_interface') and 
-            self.main_interface.processing_thread and 
-            self.main_interface.processing_thread.isRunning()):
+        if (self.main_interface is not None and 
+            self.main_interface.processing_job is not None and 
+            self.main_interface.processing_job.is_active()):
+            
+            job = self.main_interface.processing_job
+            if self._close_pending:
+                # 已确认退出，等待任务结束后由finished信号关闭窗口
+                event.ignore()
+                return
             
             dialog = MessageBox(
                 "确认退出", 
@@ -1116,63 +1617,71 @@ class MainWindow(QWidget):
                 self
             )
             
-            if dialog.exec():
-                # 停止处理线程
-                self.main_interface.processing_thread.stop()
-                
-                # 创建一个定时器来检查线程状态，避免UI卡死
-                self.close_timer = QTimer(self)
-                self.close_timer.timeout.connect(self._check_close_status)
-                self.close_timer.start(200)  # 每200毫秒检查一次
-                
-                # 保存要关闭的事件以便稍后处理
-                self.pending_close_event = event
-                event.ignore()  # 先不关闭
-            else:
+            if not dialog.exec():
                 event.ignore()
-        else:
-            # 保存窗口状态
-            self._save_window_state()
+                return
             
-            # 保存设置
-            if hasattr(self, 'main_interface'):
-                self.main_interface.save_settings()
-            event.accept()
-    
-    def _check_close_status(self):
-        """检查线程是否已经停止，以便完成窗口关闭"""
-        if not self.main_interface.processing_thread.isRunning():
-            self.close_timer.stop()
-            
-            # 保存窗口状态
-            self._save_window_state()
-            
-            # 保存设置
+            # 停止处理任务，任务结束后通过finished信号再次关闭窗口
+            self._close_pending = True
+            job.signals.finished.connect(self.close, Qt.QueuedConnection)
+            job.stop()
+            if not job.is_done():
+                event.ignore()  # 先不关闭
+                return
+        
+        # 保存窗口状态
+        self._save_window_state()
+        
+        # 保存设置
+        if self.main_interface is not None:
             self.main_interface.save_settings()
-            
-            # 接受关闭事件
-            self.pending_close_event.accept()
-            
+        if self._settings_dirty:
+            self.settings.sync()
+            self._settings_dirty = False
+        # 停止日志监听线程（会先写完队列中的日志），再将文件缓冲区写入磁盘
+        if self.log_listener is not None:
+            self.log_listener.stop()
+            self.log_listener = None
+        if file_log_handler is not None:
+            file_log_handler.sync()
+        event.accept()
+    
+    def set_log_font_size(self, size):
+        """修改日志框和进度文字的字体大小，字号未变化时不做任何操作"""
+        # setFont会使整个日志文档重新排版，字体和字号都相同时跳过
+        # （QFont的==还比较字体解析状态，设置后读回的字体与缓存字体并不相等，不能直接比较）
+        font = _mono_font(size)
+        for widget in (self.log_text, self.main_interface.progress_text):
+            current = widget.font()
+            if current.pointSize() != size or current.family() != font.family():
+                widget.setFont(font)
+    
+    def set_log_max_blocks(self, max_blocks):
+        """修改日志框最多保留的行数"""
+        if max_blocks == self._log_max_blocks:
+            return
+        self._log_max_blocks = max_blocks
+        self._log_buf = deque(self._log_buf, maxlen=max_blocks)
+        self.log_text.setMaximumBlockCount(max_blocks)
+    
+    @pyqtSlot(str)
     def update_log(self, message):
-        """更新日志输出"""
-        self.log_text.append(f"[{datetime.now().strftime('%H:%M:%S')}] {message}")
-        # 滚动到底部
-        scrollbar = self.log_text.verticalScrollBar()
-        scrollbar.setValue(scrollbar.maximum())
+        """更新日志输出（先写入缓冲区，由定时器批量刷新）"""
+        self._log_buf.append(f"{_ts()} {message}")
+        if not self._log_timer.isActive():
+            self._log_timer.start()
+    
+    def _flush_log(self):
+        """将缓冲区中的日志一次性写入日志框"""
+        if not self._log_buf:
+            return
+        entries = list(self._log_buf)
+        self._log_buf.clear()
+        # 视图已在底部时appendPlainText会自动滚动，用户向上翻看时保持当前位置
+        self.log_text.appendPlainText('\n'.join(entries))
 
 
 if __name__ == "__main__":
-    # 确保应用程序目录存在
-    os.makedirs(APP_DIR, exist_ok=True)
-    
-    # 设置应用程序日志文件
-    log_file = os.path.join(APP_DIR, "app.log")
-    file_handler = logging.FileHandler(log_file, encoding='utf-8')
-    file_handler.setFormatter(logging.Formatter('%(asctime)s - %(levelname)s - %(message)s'))
-    logger.addHandler(file_handler)
-    
-    logger.info(f"应用程序启动，版本: {VERSION}")
-    
     # 设置高DPI属性
     QApplication.setAttribute(Qt.AA_EnableHighDpiScaling)
     QApplication.setAttribute(Qt.AA_UseHighDpiPixmaps)
@@ -1180,8 +1689,21 @@ if __name__ == "__main__":
     # 创建应用程序
     app = QApplication(sys.argv)
     
+    # 设置应用程序日志文件（APP_DIR已在模块加载时由get_app_dir创建）：日志记录先放入队列，由监听线程写入文件，界面线程不等待磁盘
+    file_log_handler = BufferedFileHandler(LOG_FILE)
+    file_log_handler.setFormatter(logging.Formatter('%(asctime)s - %(levelname)s - %(message)s'))
+    app_log_queue = queue.Queue(-1)
+    logger.addHandler(logging.handlers.QueueHandler(app_log_queue))
+    log_listener = logging.handlers.QueueListener(
+        app_log_queue, file_log_handler, respect_handler_level=True
+    )
+    log_listener.start()
+    
+    logger.info(f"应用程序启动，版本: {VERSION}")
+    
     # 创建主窗口
     window = MainWindow()
+    window.log_listener = log_listener
     window.show()
     
     # 运行应用程序